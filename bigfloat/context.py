@@ -30,6 +30,18 @@ from bigfloat.rounding_mode import (
     ROUND_AWAY_FROM_ZERO,
 )
 
+# MPFR functions used on the hot path in _apply_function_in_context, bound
+# to module-level names to avoid repeated attribute lookups on the mpfr
+# module.
+_mpfr_new2 = mpfr.mpfr_new2
+_mpfr_check_range = mpfr.mpfr_check_range
+_mpfr_subnormalize = mpfr.mpfr_subnormalize
+_mpfr_number_p = mpfr.mpfr_number_p
+_mpfr_zero_p = mpfr.mpfr_zero_p
+_mpfr_get_exp = mpfr.mpfr_get_exp
+_mpfr_set_underflow = mpfr.mpfr_set_underflow
+_mpfr_set_inexflag = mpfr.mpfr_set_inexflag
+
 EMAX_MAX = mpfr.MPFR_EMAX_DEFAULT
 EMIN_MIN = mpfr.MPFR_EMIN_DEFAULT
 
@@ -40,6 +52,12 @@ EMAX_MIN = max(mpfr.MPFR_EMIN_DEFAULT, mpfr.mpfr_get_emax_min())
 EMIN_MAX = min(mpfr.MPFR_EMAX_DEFAULT, mpfr.mpfr_get_emin_max())
 
 
+# Cache of precomputed context merges, keyed by the ids of the two contexts
+# being added.  Only module-level constants (which are never deallocated,
+# so their ids are never reused) should appear in the keys.
+_merge_cache = {}
+
+
 class Context(object):
     """
     Information about output format and rounding mode.
@@ -69,7 +87,18 @@ class Context(object):
     # Contexts are supposed to be immutable.  We make the attributes
     # of a Context private, and provide properties to access them in
     # order to discourage users from trying to set the attributes
-    # directly.
+    # directly.  Contexts are created frequently (for example, on every
+    # uncached merge), so they also use __slots__ rather than an instance
+    # dictionary.  They remain weak-referenceable.
+    __slots__ = (
+        "_precision",
+        "_emin",
+        "_emax",
+        "_subnormalize",
+        "_rounding",
+        "_wide_exponent_bounds",
+        "__weakref__",
+    )
 
     def __new__(
         cls,
@@ -96,7 +125,9 @@ class Context(object):
                 "exponent bound emax should satisfy "
                 "%d <= emax <= %d" % (EMAX_MIN, EMAX_MAX)
             )
-        if rounding is not None:
+        # RoundingMode instances are immutable, so there's no need to
+        # rebuild one when merging contexts.
+        if rounding is not None and type(rounding) is not RoundingMode:
             rounding = RoundingMode(rounding)
         if subnormalize is not None and subnormalize not in [False, True]:
             raise ValueError("subnormalize should be either False or True")
@@ -106,6 +137,12 @@ class Context(object):
         self._emax = emax
         self._subnormalize = subnormalize
         self._rounding = rounding
+        # True if results computed in this context need no exponent range
+        # checks beyond those that MPFR already performs with its default
+        # exponent bounds.
+        self._wide_exponent_bounds = (
+            emin == EMIN_MIN and emax == EMAX_MAX and subnormalize is False
+        )
         return self
 
     def __add__(self, other):
@@ -114,6 +151,18 @@ class Context(object):
         both self and other, the attribute from other takes
         precedence."""
 
+        # Adding the empty context is a common no-op (it's used by every
+        # function that accepts an optional context), and some merges with
+        # module-level constants are precomputed.  Contexts are immutable,
+        # so it's safe to return an existing instance.
+        if other is EmptyContext:
+            return self
+        if not isinstance(other, Context):
+            return NotImplemented
+        merged = _merge_cache.get((id(self), id(other)))
+        if merged is not None:
+            return merged
+
         return Context(
             precision=(
                 other.precision
@@ -155,6 +204,32 @@ class Context(object):
             )
         )
 
+    def __reduce__(self):
+        return (
+            Context,
+            (
+                self.precision,
+                self.emin,
+                self.emax,
+                self.subnormalize,
+                self.rounding,
+            ),
+        )
+
+    def __setstate__(self, state):
+        # Only reached when loading a pickle written before Context had
+        # __slots__; such pickles hold the old instance dictionary.
+        other = Context(
+            precision=state["_precision"],
+            emin=state["_emin"],
+            emax=state["_emax"],
+            subnormalize=state["_subnormalize"],
+            rounding=state["_rounding"],
+        )
+        for name in Context.__slots__:
+            if name != "__weakref__":
+                setattr(self, name, getattr(other, name))
+
     @property
     def precision(self):
         return self._precision
@@ -176,18 +251,18 @@ class Context(object):
         return self._subnormalize
 
     def __repr__(self):
-        args = []
-        if self.precision is not None:
-            args.append("precision=%r" % self.precision)
-        if self.emax is not None:
-            args.append("emax=%r" % self.emax)
-        if self.emin is not None:
-            args.append("emin=%r" % self.emin)
-        if self.subnormalize is not None:
-            args.append("subnormalize=%r" % self.subnormalize)
-        if self.rounding is not None:
-            args.append("rounding=%r" % self.rounding)
-        return "Context(%s)" % ", ".join(args)
+        attributes = (
+            ("precision", self._precision),
+            ("emax", self._emax),
+            ("emin", self._emin),
+            ("subnormalize", self._subnormalize),
+            ("rounding", self._rounding),
+        )
+        return "Context(%s)" % ", ".join(
+            "%s=%r" % attribute
+            for attribute in attributes
+            if attribute[1] is not None
+        )
 
     __str__ = __repr__
 
@@ -335,12 +410,22 @@ def _apply_function_in_context(cls, f, args, context):
 
     """
     rounding = context.rounding
-    bf = mpfr.Mpfr_t.__new__(cls)
-    mpfr.mpfr_init2(bf, context.precision)
-    args = (bf,) + args + (rounding,)
-    ternary = f(*args)
+    bf = _mpfr_new2(cls, context.precision)
+    # Unary and binary functions are by far the most common; call them
+    # without building a new argument tuple.
+    nargs = len(args)
+    if nargs == 1:
+        ternary = f(bf, args[0], rounding)
+    elif nargs == 2:
+        ternary = f(bf, args[0], args[1], rounding)
+    else:
+        ternary = f(*((bf,) + args + (rounding,)))
+    if context._wide_exponent_bounds:
+        # MPFR's exponent bounds are always EMIN_MIN and EMAX_MAX outside
+        # _temporary_exponent_bounds, so there's nothing more to do.
+        return bf
     with _temporary_exponent_bounds(context.emin, context.emax):
-        ternary = mpfr.mpfr_check_range(bf, ternary, rounding)
+        ternary = _mpfr_check_range(bf, ternary, rounding)
         if context.subnormalize:
             # mpfr_subnormalize doesn't set underflow and
             # subnormal flags, so we do that ourselves.  We choose
@@ -351,24 +436,28 @@ def _apply_function_in_context(cls, f, args, context):
             # if bf is zero but ternary is nonzero, the underflow
             # flag will already have been set by mpfr_check_range;
             underflow = (
-                mpfr.mpfr_number_p(bf)
-                and not mpfr.mpfr_zero_p(bf)
+                _mpfr_number_p(bf)
+                and not _mpfr_zero_p(bf)
                 and (
-                    mpfr.mpfr_get_exp(bf)
+                    _mpfr_get_exp(bf)
                     < context.precision - 1 + context.emin
                 )
             )
             if underflow:
-                mpfr.mpfr_set_underflow()
-            ternary = mpfr.mpfr_subnormalize(bf, ternary, rounding)
+                _mpfr_set_underflow()
+            ternary = _mpfr_subnormalize(bf, ternary, rounding)
             if ternary:
-                mpfr.mpfr_set_inexflag()
+                _mpfr_set_inexflag()
     return bf
 
 
 def _apply_function_in_current_context(cls, f, args, context):
-    with (context if context is not None else EmptyContext):
-        return _apply_function_in_context(cls, f, args, getcontext())
+    # The functions applied here never consult the current context, so
+    # there's no need to push and pop the combined context around the call.
+    current = getcontext()
+    if context is not None:
+        current = current + context
+    return _apply_function_in_context(cls, f, args, current)
 
 
 # provided rounding modes are implemented as contexts, so that
@@ -378,3 +467,21 @@ RoundTowardPositive = rounding(ROUND_TOWARD_POSITIVE)
 RoundTowardNegative = rounding(ROUND_TOWARD_NEGATIVE)
 RoundTowardZero = rounding(ROUND_TOWARD_ZERO)
 RoundAwayFromZero = rounding(ROUND_AWAY_FROM_ZERO)
+
+
+def _precompute_merges(bases, deltas):
+    for base in bases:
+        for delta in deltas:
+            _merge_cache[id(base), id(delta)] = base + delta
+
+
+_precompute_merges(
+    [DefaultContext],
+    [
+        RoundTiesToEven,
+        RoundTowardPositive,
+        RoundTowardNegative,
+        RoundTowardZero,
+        RoundAwayFromZero,
+    ],
+)
@@ -21,7 +21,10 @@
 
 
 import contextlib
+import math
+import re
 import sys
+import threading
 import warnings
 
 import six
@@ -42,7 +45,9 @@ from bigfloat.context import (
     RoundTiesToEven,
     RoundTowardPositive,
     RoundTowardNegative,
+    _apply_function_in_context,
     _apply_function_in_current_context,
+    getcontext,
 )
 
 from bigfloat.formatting import (
@@ -106,8 +111,43 @@ else:
 
     _bit_length = int.bit_length
 
-# _PyHASH_2INV is the inverse of 2 modulo the prime _PyHASH_MODULUS
-_PyHASH_2INV = _builtin_pow(2, _PyHASH_MODULUS - 2, _PyHASH_MODULUS)
+# Types that are converted exactly to BigFloat in mixed-type operations.
+_implicitly_convertible_types = six.integer_types + (float,)
+
+# _PyHASH_2INV is the inverse of 2 modulo the prime _PyHASH_MODULUS; since
+# the modulus is odd, that's just (_PyHASH_MODULUS + 1) / 2.
+_PyHASH_2INV = (_PyHASH_MODULUS + 1) // 2
+
+
+# MPFR predicates used by the is_* and comparison functions, bound to
+# module-level names to avoid repeated attribute lookups on the mpfr module.
+_mpfr_nan_p = mpfr.mpfr_nan_p
+_mpfr_inf_p = mpfr.mpfr_inf_p
+_mpfr_number_p = mpfr.mpfr_number_p
+_mpfr_zero_p = mpfr.mpfr_zero_p
+_mpfr_regular_p = mpfr.mpfr_regular_p
+_mpfr_integer_p = mpfr.mpfr_integer_p
+_mpfr_signbit = mpfr.mpfr_signbit
+_mpfr_equal_p = mpfr.mpfr_equal_p
+_mpfr_less_p = mpfr.mpfr_less_p
+_mpfr_lessequal_p = mpfr.mpfr_lessequal_p
+_mpfr_greater_p = mpfr.mpfr_greater_p
+_mpfr_greaterequal_p = mpfr.mpfr_greaterequal_p
+_mpfr_lessgreater_p = mpfr.mpfr_lessgreater_p
+_mpfr_unordered_p = mpfr.mpfr_unordered_p
+
+# MPFR accessors and setters used by BigFloat methods, bound for the same
+# reason.
+_mpfr_get_prec = mpfr.mpfr_get_prec
+_mpfr_get_exp = mpfr.mpfr_get_exp
+_mpfr_get_d = mpfr.mpfr_get_d
+_mpfr_set_d = mpfr.mpfr_set_d
+_mpfr_get_str = mpfr.mpfr_get_str
+_mpfr_new2 = mpfr.mpfr_new2
+_mpfr_set = mpfr.mpfr_set
+_mpfr_set_prec = mpfr.mpfr_set_prec
+_mpfr_set_exp = mpfr.mpfr_set_exp
+_mpfr_setsign = mpfr.mpfr_setsign
 
 
 def _mpfr_get_str2(base, ndigits, op, rounding_mode):
@@ -120,8 +160,9 @@ def _mpfr_get_str2(base, ndigits, op, rounding_mode):
     Also converts the byte-string produced by mpfr_get_str to Unicode.
 
     """
-    digits, exp = mpfr.mpfr_get_str(base, ndigits, op, rounding_mode)
-    negative = digits.startswith("-")
+    digits, exp = _mpfr_get_str(base, ndigits, op, rounding_mode)
+    # mpfr_get_str never returns an empty digit string.
+    negative = digits[0] == "-"
     if negative:
         digits = digits[1:]
     return negative, digits, exp
@@ -131,6 +172,9 @@ def _mpfr_get_str2(base, ndigits, op, rounding_mode):
 # Context manager to give an easy way to change emin and emax temporarily.
 
 DBL_PRECISION = sys.float_info.mant_dig
+# Range of exponents (in the sense of mpfr_get_exp) of normal floats.
+_DBL_MIN_EXP = sys.float_info.min_exp
+_DBL_MAX_EXP = sys.float_info.max_exp
 
 # Dealing with exponent limits
 # ----------------------------
@@ -181,6 +225,23 @@ mpfr.mpfr_set_emax(EMAX_MAX)
 PRECISION_MIN = mpfr.MPFR_PREC_MIN
 PRECISION_MAX = mpfr.MPFR_PREC_MAX
 
+# Constants used to bound the decimal exponent of a BigFloat from its binary
+# exponent.  For binary exponents smaller than _DECIMAL_EXPONENT_LIMIT in
+# absolute value, the error in the floating-point product of the exponent
+# with _LOG10_2 is well below _DECIMAL_EXPONENT_SLOP.
+_LOG10_2 = math.log10(2)
+_DECIMAL_EXPONENT_LIMIT = 2 ** 30
+_DECIMAL_EXPONENT_SLOP = 1e-6
+
+
+def _is_normal_float(x):
+    """Given a nonzero finite BigFloat x, return True if x is exactly
+    representable as a normal float, else False."""
+    return (
+        _mpfr_get_prec(x) <= DBL_PRECISION
+        and _DBL_MIN_EXP <= _mpfr_get_exp(x) <= _DBL_MAX_EXP
+    )
+
 
 def _format_finite(negative, digits, dot_pos):
     """Given a (possibly empty) string of digits and an integer
@@ -189,9 +250,9 @@ def _format_finite(negative, digits, dot_pos):
     the same value and same implicit exponent."""
 
     # strip leading zeros
-    olddigits = digits
-    digits = digits.lstrip("0")
-    dot_pos -= len(olddigits) - len(digits)
+    stripped = digits.lstrip("0")
+    dot_pos -= len(digits) - len(stripped)
+    digits = stripped
 
     # value is 0.digits * 10**dot_pos
     use_exponent = dot_pos <= -4 or dot_pos > len(digits)
@@ -199,16 +260,18 @@ def _format_finite(negative, digits, dot_pos):
         exp = dot_pos - 1 if digits else dot_pos
         dot_pos -= exp
 
-    # left pad with zeros, insert decimal point, and add exponent
+    # left pad with zeros, insert decimal point, and add exponent, assembling
+    # the result in a single step
+    sign = "-" if negative else ""
+    suffix = "e%+03d" % exp if use_exponent else ""
     if dot_pos <= 0:
-        digits = "0" * (1 - dot_pos) + digits
-        dot_pos += 1 - dot_pos
-    assert 1 <= dot_pos <= len(digits)
-    if dot_pos < len(digits):
-        digits = digits[:dot_pos] + "." + digits[dot_pos:]
-    if use_exponent:
-        digits += "e{0:+03d}".format(exp)
-    return "-" + digits if negative else digits
+        if not (digits or dot_pos):
+            return sign + "0" + suffix
+        return "%s0.%s%s%s" % (sign, "0" * -dot_pos, digits, suffix)
+    elif dot_pos < len(digits):
+        return "%s%s.%s%s" % (sign, digits[:dot_pos], digits[dot_pos:], suffix)
+    else:
+        return sign + digits + suffix
 
 
 def next_up(x, context=None):
@@ -224,7 +287,7 @@ def next_up(x, context=None):
         with (context if context is not None else EmptyContext):
             with RoundTowardPositive:
                 # nan maps to itself
-                if is_nan(x):
+                if _mpfr_nan_p(x):
                     return +x
 
                 # round to current context; if value changes, we're done
@@ -252,7 +315,7 @@ def next_down(x, context=None):
         with (context if context is not None else EmptyContext):
             with RoundTowardNegative:
                 # nan maps to itself
-                if is_nan(x):
+                if _mpfr_nan_p(x):
                     return +x
 
                 # round to current context; if value changes, we're done
@@ -267,6 +330,38 @@ def next_down(x, context=None):
                 return +bf
 
 
+# Scratch BigFloat instances for temporaries that never escape to the
+# caller, one per thread.  Reusing these avoids allocating and freeing a
+# new significand for each temporary: mpfr_set_prec only reallocates when
+# the existing significand is too small.  Precisions above
+# _SCRATCH_PRECISION_MAX aren't cached, to avoid holding on to large
+# allocations.
+_scratch = threading.local()
+
+_SCRATCH_PRECISION_MAX = 4096
+
+
+def _scratch_bigfloat(precision, _scratch=_scratch):
+    """
+    Return a BigFloat with the given precision, for use as a temporary.
+
+    The returned value may be shared with other calls in the same thread, so
+    it must not be returned to the caller or kept beyond the current
+    operation.
+
+    """
+    if precision > _SCRATCH_PRECISION_MAX:
+        return _mpfr_new2(BigFloat, precision)
+
+    try:
+        result = _scratch.bigfloat
+    except AttributeError:
+        result = _scratch.bigfloat = _mpfr_new2(BigFloat, precision)
+    else:
+        _mpfr_set_prec(result, precision)
+    return result
+
+
 def _binop(op):
     def wrapped_op(self, other):
         try:
@@ -289,7 +384,42 @@ def _rbinop(op):
     return wrapped_op
 
 
+# Specialized versions of _binop and _rbinop for operations that simply apply
+# the MPFR function f in the current context, as add, sub, mul and div do.
+# These save two levels of Python function call for the common arithmetic
+# operators.
+def _mpfr_binop(f):
+    def wrapped_op(self, other):
+        try:
+            other = BigFloat._implicit_convert(other)
+        except TypeError:
+            return NotImplemented
+        return _apply_function_in_context(
+            BigFloat, f, (self, other), getcontext(),
+        )
+
+    return wrapped_op
+
+
+def _mpfr_rbinop(f):
+    def wrapped_op(self, other):
+        try:
+            other = BigFloat._implicit_convert(other)
+        except TypeError:
+            return NotImplemented
+        return _apply_function_in_context(
+            BigFloat, f, (other, self), getcontext(),
+        )
+
+    return wrapped_op
+
+
 class BigFloat(mpfr.Mpfr_t):
+    # BigFloat instances carry no state beyond the underlying mpfr_t; without
+    # an instance dictionary they're smaller and cheaper to create and free.
+    # They remain weak-referenceable.
+    __slots__ = ("__weakref__",)
+
     def __new__(cls, value, context=None):
         """Create BigFloat from integer, float, string or another BigFloat.
 
@@ -304,14 +434,20 @@ class BigFloat(mpfr.Mpfr_t):
             with context:
                 return cls(value)
 
+        # Floats and BigFloats are set directly with the corresponding MPFR
+        # function, rather than via the _set_d and pos wrappers.
         if isinstance(value, float):
-            return _set_d(value)
+            return _apply_function_in_context(
+                BigFloat, _mpfr_set_d, (value,), getcontext(),
+            )
         elif isinstance(value, six.string_types):
-            return set_str2(value.strip(), 10)
+            return set_str2(value, 10)
         elif isinstance(value, six.integer_types):
             return set_str2("%x" % value, 16)
         elif isinstance(value, BigFloat):
-            return pos(value)
+            return _apply_function_in_context(
+                BigFloat, _mpfr_set, (value,), getcontext(),
+            )
         else:
             raise TypeError(
                 "Can't convert argument %s of type %s "
@@ -331,6 +467,14 @@ class BigFloat(mpfr.Mpfr_t):
 
         This constructor makes no use of the current context.
         """
+        # Fast path for floats, the most common case in implicit conversions.
+        # Conversion at double precision is always exact, and for a non-nan
+        # sets no flags, so the context and flag handling below isn't needed.
+        if type(value) is float and precision is None and value == value:
+            result = _mpfr_new2(BigFloat, DBL_PRECISION)
+            _mpfr_set_d(result, value, ROUND_TIES_TO_EVEN)
+            return result
+
         # figure out precision to use
         if isinstance(value, six.string_types):
             if precision is None:
@@ -359,7 +503,7 @@ class BigFloat(mpfr.Mpfr_t):
 
         # Use unlimited exponents, with given precision.
         with _saved_flags():
-            set_flagstate(set())  # clear all flags
+            _set_flagmask(0)  # clear all flags
             context = (
                 WideExponentContext
                 + Context(precision=precision)
@@ -367,11 +511,11 @@ class BigFloat(mpfr.Mpfr_t):
             )
             with context:
                 result = BigFloat(value)
-            if test_flag(Overflow):
+            if Overflow.test():
                 raise ValueError("value too large to represent as a BigFloat")
-            if test_flag(Underflow):
+            if Underflow.test():
                 raise ValueError("value too small to represent as a BigFloat")
-            if test_flag(Inexact) and not isinstance(value, six.string_types):
+            if Inexact.test() and not isinstance(value, six.string_types):
                 # since this is supposed to be an exact conversion, the
                 # inexact flag should never be set except when converting
                 # from a string.
@@ -390,7 +534,7 @@ class BigFloat(mpfr.Mpfr_t):
         """
         # convert via hex string; rounding mode doesn't matter here,
         # since conversion should be exact
-        if not is_finite(self):
+        if not _mpfr_number_p(self):
             raise ValueError("Can't convert infinity or nan to integer")
 
         # Conversion to base 16 is exact, so any rounding mode will do.
@@ -409,7 +553,7 @@ class BigFloat(mpfr.Mpfr_t):
         Rounds using RoundTiesToEven, regardless of current rounding mode.
 
         """
-        return mpfr.mpfr_get_d(self, ROUND_TIES_TO_EVEN)
+        return _mpfr_get_d(self, ROUND_TIES_TO_EVEN)
 
     def __format__(self, format_specifier):
         """ Support for formatting BigFloat instances. """
@@ -423,9 +567,10 @@ class BigFloat(mpfr.Mpfr_t):
             precision = spec["precision"]
             # Default number of digits after the point for %-formatting is 8.
             digits_after = precision + 2 if precision is not None else 8
-            mpfr_format_template = "%{alternate}.{prec}R{rounding}f"
-            mpfr_format_spec = mpfr_format_template.format(
-                prec=digits_after, **spec
+            mpfr_format_spec = "%%%s.%dR%sf" % (
+                spec["alternate"],
+                digits_after,
+                spec["rounding"],
             )
             formatted = mpfr.mpfr_asprintf(mpfr_format_spec, self)
 
@@ -436,11 +581,9 @@ class BigFloat(mpfr.Mpfr_t):
                 sign, body = "", formatted
 
             if body not in ("inf", "nan"):
+                # body has the form <digits>.<digits_after digits>.
                 before = body[: -digits_after - 1]
                 after = body[-digits_after:]
-                assert before.isdigit()
-                assert after.isdigit()
-                assert body[-digits_after - 1] == "."
 
                 # Move two digits from after to before, strip leading zeros,
                 # and reconsistute.
@@ -454,11 +597,15 @@ class BigFloat(mpfr.Mpfr_t):
             # minimum field width ourselves in post-processing, along with PEP
             # 3101-style filling and padding.
             if spec["precision"] is not None:
-                prec = ".{}".format(spec["precision"])
+                prec = ".%d" % spec["precision"]
             else:
                 prec = ""
-            mpfr_format_template = "%{alternate}{prec}R{rounding}{type}"
-            mpfr_format_spec = mpfr_format_template.format(prec=prec, **spec)
+            mpfr_format_spec = "%%%s%sR%s%s" % (
+                spec["alternate"],
+                prec,
+                spec["rounding"],
+                spec["type"],
+            )
             formatted = mpfr.mpfr_asprintf(mpfr_format_spec, self)
 
         # Extract the sign, if any.
@@ -474,7 +621,7 @@ class BigFloat(mpfr.Mpfr_t):
         return format_align(sign, body, spec)
 
     def _sign(self):
-        return mpfr.mpfr_signbit(self)
+        return _mpfr_signbit(self)
 
     def _significand(self):
         """Return the significand of self, as a BigFloat.
@@ -491,10 +638,9 @@ class BigFloat(mpfr.Mpfr_t):
         the sign set to 0.
 
         """
-        m = self.copy()
-        if self and is_finite(self):
-            mpfr.mpfr_set_exp(m, 0)
-        mpfr.mpfr_setsign(m, m, False, ROUND_TIES_TO_EVEN)
+        m = self.copy_abs()
+        if _mpfr_regular_p(self):
+            _mpfr_set_exp(m, 0)
         return m
 
     def _exponent(self):
@@ -507,14 +653,14 @@ class BigFloat(mpfr.Mpfr_t):
         of '0', 'inf' or 'nan'.
 
         """
-        if self and is_finite(self):
-            return mpfr.mpfr_get_exp(self)
+        if _mpfr_regular_p(self):
+            return _mpfr_get_exp(self)
 
-        if not self:
+        if _mpfr_zero_p(self):
             return "0"
-        elif is_inf(self):
+        elif _mpfr_inf_p(self):
             return "inf"
-        elif is_nan(self):
+        elif _mpfr_nan_p(self):
             return "nan"
         else:
             assert False, "shouldn't ever get here"
@@ -526,9 +672,8 @@ class BigFloat(mpfr.Mpfr_t):
         same precision as the original.
 
         """
-        result = mpfr.Mpfr_t.__new__(BigFloat)
-        mpfr.mpfr_init2(result, self.precision)
-        mpfr.mpfr_set(result, self, ROUND_TIES_TO_EVEN)
+        result = _mpfr_new2(BigFloat, _mpfr_get_prec(self))
+        _mpfr_set(result, self, ROUND_TIES_TO_EVEN)
         return result
 
     def copy_neg(self):
@@ -538,10 +683,9 @@ class BigFloat(mpfr.Mpfr_t):
         has the same precision as the original.
 
         """
-        result = mpfr.Mpfr_t.__new__(BigFloat)
-        mpfr.mpfr_init2(result, self.precision)
+        result = _mpfr_new2(BigFloat, _mpfr_get_prec(self))
         new_sign = not self._sign()
-        mpfr.mpfr_setsign(result, self, new_sign, ROUND_TIES_TO_EVEN)
+        _mpfr_setsign(result, self, new_sign, ROUND_TIES_TO_EVEN)
         return result
 
     def copy_abs(self):
@@ -551,24 +695,25 @@ class BigFloat(mpfr.Mpfr_t):
         has the same precision as the original.
 
         """
-        result = mpfr.Mpfr_t.__new__(BigFloat)
-        mpfr.mpfr_init2(result, self.precision)
-        mpfr.mpfr_setsign(result, self, False, ROUND_TIES_TO_EVEN)
+        result = _mpfr_new2(BigFloat, _mpfr_get_prec(self))
+        _mpfr_setsign(result, self, False, ROUND_TIES_TO_EVEN)
         return result
 
     def hex(self):
         """Return a hexadecimal representation of a BigFloat."""
 
-        sign = "-" if self._sign() else ""
-        e = self._exponent()
-        if isinstance(e, six.string_types):
-            return sign + e
+        sign = "-" if _mpfr_signbit(self) else ""
+        # Classify once: zeros, infinities and nans are handled by _exponent.
+        if not _mpfr_regular_p(self):
+            return sign + self._exponent()
 
-        m = self._significand()
+        e = _mpfr_get_exp(self)
+        m = self.copy_abs()
+        _mpfr_set_exp(m, 0)
         _, digits, _ = _mpfr_get_str2(16, 0, m, ROUND_TIES_TO_EVEN,)
-        # only print the number of digits that are actually necessary
-        n = 1 + (self.precision - 1) // 4
-        assert all(c == "0" for c in digits[n:])
+        # only print the number of digits that are actually necessary; any
+        # digits beyond the first n are zero
+        n = 1 + (_mpfr_get_prec(self) - 1) // 4
         result = "%s0x0.%sp%+d" % (sign, digits[:n], e)
         return result
 
@@ -577,22 +722,27 @@ class BigFloat(mpfr.Mpfr_t):
         exactly equal to n/d, n and d are relatively prime, and d >= 1.
 
         """
-        if not is_finite(self):
-            raise ValueError(
-                "Can't express infinity or nan as " "an integer ratio"
-            )
-        elif not self:
+        if not _mpfr_regular_p(self):
+            if not _mpfr_number_p(self):
+                raise ValueError(
+                    "Can't express infinity or nan as " "an integer ratio"
+                )
             return 0, 1
 
+        # if self is exactly representable as a normal float, let the float
+        # do the work
+        if _is_normal_float(self):
+            return _mpfr_get_d(self, ROUND_TIES_TO_EVEN).as_integer_ratio()
+
         # convert to a hex string, and from there to a fraction
         negative, digits, e = _mpfr_get_str2(16, 0, self, ROUND_TIES_TO_EVEN,)
         digits = digits.rstrip("0")
 
-        # find number of trailing 0 bits in last hex digit
+        # the last hex digit is nonzero, so it holds all the trailing 0 bits
         v = int(digits[-1], 16)
-        v &= -v
-        n, d = int(digits, 16) // v, 1
-        e = (e - len(digits) << 2) + {1: 0, 2: 1, 4: 2, 8: 3}[v]
+        tz = (v & -v).bit_length() - 1
+        n, d = int(digits, 16) >> tz, 1
+        e = ((e - len(digits)) << 2) + tz
 
         # abs(number) now has value n * 2**e, and n is odd
         if e >= 0:
@@ -603,9 +753,9 @@ class BigFloat(mpfr.Mpfr_t):
         return (-n if negative else n), d
 
     def _str_format(self, rounding_mode=ROUND_TIES_TO_EVEN, precision=None):
-        if is_zero(self):
-            return "-0" if is_negative(self) else "0"
-        elif is_finite(self):
+        # Test for the common case of a nonzero finite number first, so that
+        # it needs only a single classification call.
+        if _mpfr_regular_p(self):
             negative, digits, e = _mpfr_get_str2(
                 10,
                 0 if precision is None else max(1, precision),
@@ -613,10 +763,12 @@ class BigFloat(mpfr.Mpfr_t):
                 rounding_mode,
             )
             return _format_finite(negative, digits, e)
-        elif is_inf(self):
-            return "-inf" if is_negative(self) else "inf"
+        elif _mpfr_zero_p(self):
+            return "-0" if _mpfr_signbit(self) else "0"
+        elif _mpfr_inf_p(self):
+            return "-inf" if _mpfr_signbit(self) else "inf"
         else:
-            assert is_nan(self)
+            assert _mpfr_nan_p(self)
             return "nan"
 
     def __str__(self):
@@ -624,8 +776,8 @@ class BigFloat(mpfr.Mpfr_t):
 
     def __repr__(self):
         return "BigFloat.exact('%s', precision=%d)" % (
-            str(self),
-            self.precision,
+            self._str_format(),
+            _mpfr_get_prec(self),
         )
 
     def _format_to_floating_precision(self, precision):
@@ -652,6 +804,25 @@ class BigFloat(mpfr.Mpfr_t):
 
         return sign, digits, exp - len(digits)
 
+    def _decimal_exponent(self):
+        """ Return the unique integer exp such that 10**(exp-1) <= abs(self) <
+        10**exp.  self should be finite and nonzero.
+
+        """
+        # The binary exponent e2 satisfies 2**(e2-1) <= abs(self) < 2**e2,
+        # which usually determines exp.  Only make the (comparatively
+        # expensive) call to get_str2 in the cases where it doesn't.
+        e2 = _mpfr_get_exp(self)
+        if _builtin_abs(e2) < _DECIMAL_EXPONENT_LIMIT:
+            low = math.floor((e2 - 1) * _LOG10_2 - _DECIMAL_EXPONENT_SLOP)
+            high = math.ceil(e2 * _LOG10_2 + _DECIMAL_EXPONENT_SLOP)
+            if high == low + 1:
+                # math.ceil returns a float on Python 2.
+                return int(high)
+
+        _, _, exp = _mpfr_get_str2(10, 2, self, ROUND_TOWARD_ZERO,)
+        return exp
+
     def _format_to_fixed_precision(self, precision):
         """ Format 'self' to a given number of digits after the decimal point.
 
@@ -675,20 +846,18 @@ class BigFloat(mpfr.Mpfr_t):
         #
         #   (3) Adjust output if necessary if it's been rounded up to 10**e.
 
-        # Zeros
-        if is_zero(self):
-            return is_negative(self), "0", -precision
-
-        # Specials
-        if is_inf(self):
-            return is_negative(self), "inf", None
-
-        if is_nan(self):
-            return is_negative(self), "nan", None
+        # Zeros and specials.  Check for the common regular case first, so
+        # that it costs a single predicate call.
+        if not _mpfr_regular_p(self):
+            if _mpfr_zero_p(self):
+                return _mpfr_signbit(self), "0", -precision
+            elif _mpfr_inf_p(self):
+                return _mpfr_signbit(self), "inf", None
+            else:
+                return _mpfr_signbit(self), "nan", None
 
-        # Figure out the exponent by making a call to get_str2.  exp satisfies
-        # 10**(exp-1) <= self < 10**exp
-        _, _, exp = _mpfr_get_str2(10, 2, self, ROUND_TOWARD_ZERO,)
+        # Figure out the exponent exp satisfying 10**(exp-1) <= self < 10**exp
+        exp = self._decimal_exponent()
 
         sig_figs = exp + precision
 
@@ -702,13 +871,14 @@ class BigFloat(mpfr.Mpfr_t):
             sign, digits, new_exp = _mpfr_get_str2(
                 10, 2, self, ROUND_TOWARD_NEGATIVE,
             )
-            if int(digits) == 50:
+            # digits is always a two-digit string here.
+            if digits == "50":
                 # Halfway case
                 sign, digits, new_exp = _mpfr_get_str2(
                     10, 2, self, ROUND_TOWARD_POSITIVE,
                 )
 
-            digits = "1" if int(digits) > 50 or new_exp == exp + 1 else "0"
+            digits = "1" if digits > "50" or new_exp == exp + 1 else "0"
             return sign, digits, -precision
 
         negative, digits, new_exp = self._format_to_floating_precision(
@@ -730,8 +900,9 @@ class BigFloat(mpfr.Mpfr_t):
             # if self is exactly representable as a float, then its hash
             # should match that of the float.  Note that this covers the
             # case where self == 0.
-            if self == float(self) or is_nan(self):
-                return hash(float(self))
+            f = float(self)
+            if self == f or _mpfr_nan_p(self):
+                return hash(f)
 
             # now we must ensure that hash(self) == hash(int(self)) in the
             # case where self is integral.  We use the (undocumented) fact
@@ -758,7 +929,7 @@ class BigFloat(mpfr.Mpfr_t):
             return hash(-n if negative else n)
 
         def __nonzero__(self):
-            return not is_zero(self)
+            return not _mpfr_zero_p(self)
 
         def __long__(self):
             return long_integer_type(self.__int__())
@@ -766,13 +937,18 @@ class BigFloat(mpfr.Mpfr_t):
     else:
 
         def __hash__(self):
-            if is_nan(self):
+            if _mpfr_nan_p(self):
                 return _PyHASH_NAN
-            elif is_inf(self):
-                return -_PyHASH_INF if is_negative(self) else _PyHASH_INF
-            elif is_zero(self):
+            elif _mpfr_inf_p(self):
+                return -_PyHASH_INF if _mpfr_signbit(self) else _PyHASH_INF
+            elif _mpfr_zero_p(self):
                 return 0
 
+            # Python's numeric hash depends only on the value, so a BigFloat
+            # that's exactly equal to a float can share the float's hash.
+            if _is_normal_float(self):
+                return hash(_mpfr_get_d(self, ROUND_TIES_TO_EVEN))
+
             negative, digits, e = _mpfr_get_str2(
                 16, 0, self, ROUND_TIES_TO_EVEN,
             )
@@ -789,14 +965,13 @@ class BigFloat(mpfr.Mpfr_t):
             return -2 if ans == -1 else ans
 
         def __bool__(self):
-            return not is_zero(self)
+            return not _mpfr_zero_p(self)
 
         def _round_to_nearest_int(self):
             """Round self to the nearest integer.
 
             """
-            result = mpfr.Mpfr_t.__new__(BigFloat)
-            mpfr.mpfr_init2(result, self.precision)
+            result = _scratch_bigfloat(self.precision)
             ternary = mpfr.mpfr_rint(result, self, ROUND_TIES_TO_EVEN)
             assert ternary in (-2, 0, 2)
             return int(result)
@@ -808,11 +983,13 @@ class BigFloat(mpfr.Mpfr_t):
             if n is None:
                 return self._round_to_nearest_int()
 
-            if is_inf(self) or is_nan(self):
+            if _mpfr_inf_p(self) or _mpfr_nan_p(self):
                 return self
             negative, digits, exponent = self._format_to_fixed_precision(n)
-            decimal_string = "{sign}{digits}E{exponent}".format(
-                sign="-" if negative else "", digits=digits, exponent=exponent,
+            decimal_string = "%s%sE%d" % (
+                "-" if negative else "",
+                digits,
+                exponent,
             )
             return set_str2(decimal_string, 10)
 
@@ -820,8 +997,7 @@ class BigFloat(mpfr.Mpfr_t):
             """Return the least integer greater than or equal to self.
 
             """
-            result = mpfr.Mpfr_t.__new__(BigFloat)
-            mpfr.mpfr_init2(result, self.precision)
+            result = _scratch_bigfloat(self.precision)
             ternary = mpfr.mpfr_ceil(result, self)
             assert ternary in (0, 2)
             return int(result)
@@ -830,8 +1006,7 @@ class BigFloat(mpfr.Mpfr_t):
             """Return the least integer greater than or equal to self.
 
             """
-            result = mpfr.Mpfr_t.__new__(BigFloat)
-            mpfr.mpfr_init2(result, self.precision)
+            result = _scratch_bigfloat(self.precision)
             ternary = mpfr.mpfr_floor(result, self)
             assert ternary in (-2, 0)
             return int(result)
@@ -840,15 +1015,14 @@ class BigFloat(mpfr.Mpfr_t):
             """Return the integer part of self, discarding any fractional part.
 
             """
-            result = mpfr.Mpfr_t.__new__(BigFloat)
-            mpfr.mpfr_init2(result, self.precision)
+            result = _scratch_bigfloat(self.precision)
             ternary = mpfr.mpfr_trunc(result, self)
             assert ternary in (-2, 0, 2)
             return int(result)
 
     @property
     def precision(self):
-        return mpfr.mpfr_get_prec(self)
+        return _mpfr_get_prec(self)
 
     @classmethod
     def _implicit_convert(cls, arg):
@@ -856,9 +1030,16 @@ class BigFloat(mpfr.Mpfr_t):
         functions, etc.  Return value should be an instance of
         BigFloat."""
 
+        # Fast paths for the most common exact types.
+        arg_type = type(arg)
+        if arg_type is BigFloat:
+            return arg
+        elif arg_type is int or arg_type is float:
+            return cls.exact(arg)
+
         # ints, long and floats mix freely with BigFloats, and are
         # converted exactly.
-        if isinstance(arg, six.integer_types) or isinstance(arg, float):
+        if isinstance(arg, _implicitly_convertible_types):
             return cls.exact(arg)
         elif isinstance(arg, BigFloat):
             return arg
@@ -876,31 +1057,49 @@ class BigFloat(mpfr.Mpfr_t):
 # normal use.  We need functions to save and restore the current flag
 # state.
 
-Inexact = "Inexact"
-Overflow = "Overflow"
-Underflow = "Underflow"
-NanFlag = "NanFlag"
-ZeroDivision = "ZeroDivision"
+
+class _Flag(str):
+    """
+    A single MPFR flag.
+
+    Flags are strings, equal to their names, so that they can be used
+    anywhere a flag name is expected.  Each flag also carries direct
+    references to the MPFR functions that test, set and clear it, along
+    with the MPFR bitmask for the flag.
+
+    """
+
+    def __new__(cls, name, mask, mpfr_name):
+        self = str.__new__(cls, name)
+        self.mask = mask
+        self.test = getattr(mpfr, "mpfr_" + mpfr_name + "_p")
+        self.set = getattr(mpfr, "mpfr_set_" + mpfr_name)
+        self.clear = getattr(mpfr, "mpfr_clear_" + mpfr_name)
+        return self
+
+    def __reduce__(self):
+        return _as_flag, (str(self),)
+
+
+Inexact = _Flag("Inexact", mpfr.MPFR_FLAGS_INEXACT, "inexflag")
+Overflow = _Flag("Overflow", mpfr.MPFR_FLAGS_OVERFLOW, "overflow")
+Underflow = _Flag("Underflow", mpfr.MPFR_FLAGS_UNDERFLOW, "underflow")
+NanFlag = _Flag("NanFlag", mpfr.MPFR_FLAGS_NAN, "nanflag")
+ZeroDivision = _Flag("ZeroDivision", mpfr.MPFR_FLAGS_DIVBY0, "divby0")
 
 _all_flags = {Inexact, Overflow, Underflow, NanFlag, ZeroDivision}
 
-_flag_translate = {
-    "underflow": Underflow,
-    "overflow": Overflow,
-    "nanflag": NanFlag,
-    "inexflag": Inexact,
-    "divby0": ZeroDivision,
-}
+_flags_by_name = dict((str(f), f) for f in _all_flags)
 
-_clear_flag_fns = dict(
-    (v, getattr(mpfr, "mpfr_clear_" + k)) for k, v in _flag_translate.items()
-)
-_set_flag_fns = dict(
-    (v, getattr(mpfr, "mpfr_set_" + k)) for k, v in _flag_translate.items()
-)
-_test_flag_fns = dict(
-    (v, getattr(mpfr, "mpfr_" + k + "_p")) for k, v in _flag_translate.items()
-)
+
+def _as_flag(f):
+    """
+    Convert a flag or a flag name to the corresponding flag.
+
+    """
+    if isinstance(f, _Flag):
+        return f
+    return _flags_by_name[f]
 
 
 def test_flag(f):
@@ -908,7 +1107,7 @@ def test_flag(f):
     Return True if the given flag is set, and False otherwise.
 
     """
-    return _test_flag_fns[f]()
+    return _as_flag(f).test()
 
 
 def set_flag(f):
@@ -916,7 +1115,7 @@ def set_flag(f):
     Set the given flag.
 
     """
-    return _set_flag_fns[f]()
+    return _as_flag(f).set()
 
 
 def clear_flag(f):
@@ -924,7 +1123,7 @@ def clear_flag(f):
     Clear the given flag.
 
     """
-    return _clear_flag_fns[f]()
+    return _as_flag(f).clear()
 
 
 def get_flagstate():
@@ -932,7 +1131,7 @@ def get_flagstate():
     Return a set containing the flags that are currently set.
 
     """
-    return set(f for f in _all_flags if test_flag(f))
+    return set(f for f in _all_flags if f.test())
 
 
 def set_flagstate(flagset):
@@ -943,10 +1142,34 @@ def set_flagstate(flagset):
     if not flagset <= _all_flags:
         raise ValueError("unrecognized flags in flagset")
 
-    for f in flagset:
-        set_flag(f)
-    for f in _all_flags - flagset:
-        clear_flag(f)
+    for f in _all_flags:
+        if f in flagset:
+            f.set()
+        else:
+            f.clear()
+
+
+# Internally, we represent the flag state as an MPFR flags bitmask, which is
+# cheaper to save and restore than a set.  The erange flag has no
+# corresponding _Flag, so it's excluded when restoring.
+_all_flags_mask = (
+    Inexact.mask
+    | Overflow.mask
+    | Underflow.mask
+    | NanFlag.mask
+    | ZeroDivision.mask
+)
+
+# Return the current flag state as a bitmask.
+_get_flagmask = mpfr.mpfr_flags_save
+
+
+def _set_flagmask(mask):
+    """
+    Set the flags whose bits are set in ``mask``, and clear all other flags.
+
+    """
+    mpfr.mpfr_flags_restore(mask, _all_flags_mask)
 
 
 @contextlib.contextmanager
@@ -954,11 +1177,11 @@ def _saved_flags():
     """Save current flags for the duration of a with block.  Restore
     those original flags after the block completes."""
 
-    old_flags = get_flagstate()
+    old_flags = _get_flagmask()
     try:
         yield
     finally:
-        set_flagstate(old_flags)
+        _set_flagmask(old_flags)
 
 
 def _set_d(x, context=None):
@@ -981,6 +1204,11 @@ def _set_from_whole_string(rop, s, base, rnd):
     return ternary
 
 
+# Matches decimal integer strings with at most 15 digits.  Any such integer is
+# smaller than 2**53 in absolute value, so is exactly representable as a float.
+_is_short_decimal_integer = re.compile(r"[-+]?[0-9]{1,15}\Z").match
+
+
 def set_str2(s, base, context=None):
     """
     Convert the string ``s`` in base ``base`` to a BigFloat instance, rounding
@@ -990,6 +1218,10 @@ def set_str2(s, base, context=None):
     base.
 
     """
+    if base == 10 and _is_short_decimal_integer(s.strip()):
+        # The value is exactly representable as a float, so converting via
+        # float rounds only once, exactly as mpfr_strtofr would.
+        return _set_d(float(s), context)
     return _apply_function_in_current_context(
         BigFloat, _set_from_whole_string, (s, base), context,
     )
@@ -1372,7 +1604,7 @@ def cmp(op1, op2):
     """
     op1 = BigFloat._implicit_convert(op1)
     op2 = BigFloat._implicit_convert(op2)
-    if is_nan(op1) or is_nan(op2):
+    if _mpfr_nan_p(op1) or _mpfr_nan_p(op2):
         raise ValueError("Cannot perform comparison with NaN.")
     return mpfr.mpfr_cmp(op1, op2)
 
@@ -1394,7 +1626,7 @@ def cmpabs(op1, op2):
     """
     op1 = BigFloat._implicit_convert(op1)
     op2 = BigFloat._implicit_convert(op2)
-    if is_nan(op1) or is_nan(op2):
+    if _mpfr_nan_p(op1) or _mpfr_nan_p(op2):
         raise ValueError("Cannot perform comparison with NaN.")
     return mpfr.mpfr_cmpabs(op1, op2)
 
@@ -1402,15 +1634,17 @@ def cmpabs(op1, op2):
 def is_nan(x):
     """ Return True if x is a NaN, else False. """
 
-    x = BigFloat._implicit_convert(x)
-    return mpfr.mpfr_nan_p(x)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    return _mpfr_nan_p(x)
 
 
 def is_inf(x):
     """ Return True if x is an infinity, else False. """
 
-    x = BigFloat._implicit_convert(x)
-    return mpfr.mpfr_inf_p(x)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    return _mpfr_inf_p(x)
 
 
 def is_finite(x):
@@ -1420,22 +1654,25 @@ def is_finite(x):
     infinity or a NaN.
 
     """
-    x = BigFloat._implicit_convert(x)
-    return mpfr.mpfr_number_p(x)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    return _mpfr_number_p(x)
 
 
 def is_zero(x):
     """ Return True if x is a zero, else False. """
 
-    x = BigFloat._implicit_convert(x)
-    return mpfr.mpfr_zero_p(x)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    return _mpfr_zero_p(x)
 
 
 def is_regular(x):
     """ Return True if x is finite and nonzero, else False. """
 
-    x = BigFloat._implicit_convert(x)
-    return mpfr.mpfr_regular_p(x)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    return _mpfr_regular_p(x)
 
 
 def sgn(x):
@@ -1449,7 +1686,7 @@ def sgn(x):
 
     """
     x = BigFloat._implicit_convert(x)
-    if is_nan(x):
+    if _mpfr_nan_p(x):
         raise ValueError("Cannot take sign of a NaN.")
     return mpfr.mpfr_sgn(x)
 
@@ -1461,9 +1698,11 @@ def greater(x, y):
     This function returns False whenever x and/or y is a NaN.
 
     """
-    x = BigFloat._implicit_convert(x)
-    y = BigFloat._implicit_convert(y)
-    return mpfr.mpfr_greater_p(x, y)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    if type(y) is not BigFloat:
+        y = BigFloat._implicit_convert(y)
+    return _mpfr_greater_p(x, y)
 
 
 def greaterequal(x, y):
@@ -1473,9 +1712,11 @@ def greaterequal(x, y):
     This function returns False whenever x and/or y is a NaN.
 
     """
-    x = BigFloat._implicit_convert(x)
-    y = BigFloat._implicit_convert(y)
-    return mpfr.mpfr_greaterequal_p(x, y)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    if type(y) is not BigFloat:
+        y = BigFloat._implicit_convert(y)
+    return _mpfr_greaterequal_p(x, y)
 
 
 def less(x, y):
@@ -1485,9 +1726,11 @@ def less(x, y):
     This function returns False whenever x and/or y is a NaN.
 
     """
-    x = BigFloat._implicit_convert(x)
-    y = BigFloat._implicit_convert(y)
-    return mpfr.mpfr_less_p(x, y)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    if type(y) is not BigFloat:
+        y = BigFloat._implicit_convert(y)
+    return _mpfr_less_p(x, y)
 
 
 def lessequal(x, y):
@@ -1497,9 +1740,11 @@ def lessequal(x, y):
     This function returns False whenever x and/or y is a NaN.
 
     """
-    x = BigFloat._implicit_convert(x)
-    y = BigFloat._implicit_convert(y)
-    return mpfr.mpfr_lessequal_p(x, y)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    if type(y) is not BigFloat:
+        y = BigFloat._implicit_convert(y)
+    return _mpfr_lessequal_p(x, y)
 
 
 def equal(x, y):
@@ -1509,9 +1754,11 @@ def equal(x, y):
     This function returns False whenever x and/or y is a NaN.
 
     """
-    x = BigFloat._implicit_convert(x)
-    y = BigFloat._implicit_convert(y)
-    return mpfr.mpfr_equal_p(x, y)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    if type(y) is not BigFloat:
+        y = BigFloat._implicit_convert(y)
+    return _mpfr_equal_p(x, y)
 
 
 def notequal(x, y):
@@ -1521,9 +1768,11 @@ def notequal(x, y):
     This function returns True whenever x and/or y is a NaN.
 
     """
-    x = BigFloat._implicit_convert(x)
-    y = BigFloat._implicit_convert(y)
-    return not mpfr.mpfr_equal_p(x, y)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    if type(y) is not BigFloat:
+        y = BigFloat._implicit_convert(y)
+    return not _mpfr_equal_p(x, y)
 
 
 def lessgreater(x, y):
@@ -1533,9 +1782,11 @@ def lessgreater(x, y):
     This function returns False whenever x and/or y is a NaN.
 
     """
-    x = BigFloat._implicit_convert(x)
-    y = BigFloat._implicit_convert(y)
-    return mpfr.mpfr_lessgreater_p(x, y)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    if type(y) is not BigFloat:
+        y = BigFloat._implicit_convert(y)
+    return _mpfr_lessgreater_p(x, y)
 
 
 def unordered(x, y):
@@ -1543,9 +1794,11 @@ def unordered(x, y):
     Return True if x or y is a NaN and False otherwise.
 
     """
-    x = BigFloat._implicit_convert(x)
-    y = BigFloat._implicit_convert(y)
-    return mpfr.mpfr_unordered_p(x, y)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    if type(y) is not BigFloat:
+        y = BigFloat._implicit_convert(y)
+    return _mpfr_unordered_p(x, y)
 
 
 ###############################################################################
@@ -2479,8 +2732,9 @@ def remainder(x, y, context=None):
 def is_integer(x):
     """ Return True if x is an exact integer, else False. """
 
-    x = BigFloat._implicit_convert(x)
-    return mpfr.mpfr_integer_p(x)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    return _mpfr_integer_p(x)
 
 
 ###############################################################################
@@ -2528,8 +2782,9 @@ def is_negative(x):
     Note that this function returns True for negative zeros.
 
     """
-    x = BigFloat._implicit_convert(x)
-    return mpfr.mpfr_signbit(x)
+    if type(x) is not BigFloat:
+        x = BigFloat._implicit_convert(x)
+    return _mpfr_signbit(x)
 
 
 def copysign(x, y, context=None):
@@ -2551,25 +2806,25 @@ BigFloat.__neg__ = neg
 BigFloat.__abs__ = abs
 
 # binary arithmetic operations
-BigFloat.__add__ = _binop(add)
-BigFloat.__sub__ = _binop(sub)
-BigFloat.__mul__ = _binop(mul)
-BigFloat.__truediv__ = _binop(div)
+BigFloat.__add__ = _mpfr_binop(mpfr.mpfr_add)
+BigFloat.__sub__ = _mpfr_binop(mpfr.mpfr_sub)
+BigFloat.__mul__ = _mpfr_binop(mpfr.mpfr_mul)
+BigFloat.__truediv__ = _mpfr_binop(mpfr.mpfr_div)
 BigFloat.__floordiv__ = _binop(floordiv)
 if sys.version_info < (3,):
-    BigFloat.__div__ = _binop(div)
+    BigFloat.__div__ = _mpfr_binop(mpfr.mpfr_div)
 BigFloat.__pow__ = _binop(pow)
 BigFloat.__mod__ = _binop(mod)
 BigFloat.__divmod__ = _binop(divmod)
 
 # and their reverse operations
-BigFloat.__radd__ = _rbinop(add)
-BigFloat.__rsub__ = _rbinop(sub)
-BigFloat.__rmul__ = _rbinop(mul)
-BigFloat.__rtruediv__ = _rbinop(div)
+BigFloat.__radd__ = _mpfr_rbinop(mpfr.mpfr_add)
+BigFloat.__rsub__ = _mpfr_rbinop(mpfr.mpfr_sub)
+BigFloat.__rmul__ = _mpfr_rbinop(mpfr.mpfr_mul)
+BigFloat.__rtruediv__ = _mpfr_rbinop(mpfr.mpfr_div)
 BigFloat.__rfloordiv__ = _rbinop(floordiv)
 if sys.version_info < (3,):
-    BigFloat.__rdiv__ = _rbinop(div)
+    BigFloat.__rdiv__ = _mpfr_rbinop(mpfr.mpfr_div)
 BigFloat.__rpow__ = _rbinop(pow)
 BigFloat.__rmod__ = _rbinop(mod)
 BigFloat.__rdivmod__ = _rbinop(divmod)
@@ -19,6 +19,10 @@ from bigfloat.core import _bit_length
 from bigfloat.context import Context
 
 
+# Precisions of the binary interchange formats of width at most 128.
+_small_format_precisions = {16: 11, 32: 24, 64: 53, 128: 113}
+
+
 def IEEEContext(bitwidth):
     """
     Return IEEE 754-2008 context for a given bit width.
@@ -32,7 +36,7 @@ def IEEEContext(bitwidth):
 
     """
     try:
-        precision = {16: 11, 32: 24, 64: 53, 128: 113}[bitwidth]
+        precision = _small_format_precisions[bitwidth]
     except KeyError:
         if not (bitwidth >= 128 and bitwidth % 32 == 0):
             raise ValueError(
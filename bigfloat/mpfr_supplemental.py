@@ -33,8 +33,7 @@ def _quotient_exponent(x, y):
     assert mpfr.mpfr_regular_p(y)
 
     # Make copy of x with the exponent of y.
-    x2 = mpfr.Mpfr_t()
-    mpfr.mpfr_init2(x2, mpfr.mpfr_get_prec(x))
+    x2 = mpfr.mpfr_new2(mpfr.Mpfr_t, mpfr.mpfr_get_prec(x))
     mpfr.mpfr_set(x2, x, mpfr.MPFR_RNDN)
     mpfr.mpfr_set_exp(x2, mpfr.mpfr_get_exp(y))
 
@@ -124,8 +123,7 @@ def mpfr_floordiv(rop, x, y, rnd):
     # Slow version: compute to sufficient bits to get integer precision.  Given
     # that 2**(e-1) <= x / y < 2**e, need >= e bits of precision.
     z_prec = max(e, 2)
-    z = mpfr.Mpfr_t()
-    mpfr.mpfr_init2(z, z_prec)
+    z = mpfr.mpfr_new2(mpfr.Mpfr_t, z_prec)
 
     # Compute the floor exactly. The division may set the
     # inexact flag, so we save its state first.
@@ -193,8 +191,7 @@ def mpfr_mod(rop, x, y, rnd):
         return mpfr.mpfr_fmod(rop, x, y, rnd)
     else:
         p = max(mpfr.mpfr_get_prec(x), mpfr.mpfr_get_prec(y))
-        z = mpfr.Mpfr_t()
-        mpfr.mpfr_init2(z, p)
+        z = mpfr.mpfr_new2(mpfr.Mpfr_t, p)
         # Doesn't matter what rounding mode we use here; the result
         # should be exact.
         ternary = mpfr.mpfr_fmod(z, x, y, rnd)
@@ -43,14 +43,25 @@ _rounding_mode_names = {
 }
 
 
+# The RoundingMode instances defined below, keyed by integer value.
+_rounding_modes = {}
+
+
 class RoundingMode(int):
     """ Subclass of int representing a rounding mode. """
 
     def __new__(cls, value):
-        self = int.__new__(cls, value)
-        if value not in _rounding_mode_names:
+        # There are only five rounding modes, so reuse the module-level
+        # instances rather than creating a new object on each call.
+        if cls is RoundingMode:
+            self = _rounding_modes.get(value)
+            if self is not None:
+                return self
+        name = _rounding_mode_names.get(value)
+        if name is None:
             raise ValueError("Invalid rounding mode {}".format(value))
-        self._name = _rounding_mode_names[value]
+        self = int.__new__(cls, value)
+        self._name = name
         return self
 
     def __repr__(self):
@@ -64,3 +75,14 @@ ROUND_TOWARD_ZERO = RoundingMode(MPFR_RNDZ)
 ROUND_TOWARD_POSITIVE = RoundingMode(MPFR_RNDU)
 ROUND_TOWARD_NEGATIVE = RoundingMode(MPFR_RNDD)
 ROUND_AWAY_FROM_ZERO = RoundingMode(MPFR_RNDA)
+
+_rounding_modes.update(
+    (int(rounding_mode), rounding_mode)
+    for rounding_mode in [
+        ROUND_TIES_TO_EVEN,
+        ROUND_TOWARD_ZERO,
+        ROUND_TOWARD_POSITIVE,
+        ROUND_TOWARD_NEGATIVE,
+        ROUND_AWAY_FROM_ZERO,
+    ]
+)
@@ -22,12 +22,14 @@ import fractions
 import io
 import math
 import operator
+import pickle
 import random
 import struct
 import sys
 import types
 import unittest
 import warnings
+import weakref
 
 # 3rd party imports
 import pkg_resources
@@ -65,7 +67,11 @@ from bigfloat import (
     # flags
     Inexact,
     Overflow,
+    Underflow,
+    NanFlag,
     ZeroDivision,
+    test_flag as bigfloat_test_flag,
+    clear_flag,
     set_flagstate,
     get_flagstate,
     # standard arithmetic functions
@@ -120,7 +126,13 @@ from bigfloat import (
     copysign,
 )
 
-from bigfloat.core import _all_flags
+from bigfloat.core import (
+    _all_flags,
+    _all_flags_mask,
+    _get_flagmask,
+    _saved_flags,
+    _set_flagmask,
+)
 
 all_rounding_modes = [
     RoundTowardZero,
@@ -873,6 +885,33 @@ class BigFloatTests(unittest.TestCase):
         self.assertTrue(is_zero(BigFloat("-0")))
         self.assertTrue(is_negative(BigFloat("-0")))
 
+    def test_creation_from_short_integer_string(self):
+        # Short decimal integer strings take a fast path; check that it
+        # agrees with the general conversion, including flags.
+        test_values = [
+            "0",
+            "-0",
+            "+7",
+            "007",
+            "-1729",
+            "123456789012345",
+            "-999999999999999",
+            "1234567890123456",
+        ]
+        for value in test_values:
+            for p in [2, 10, 53, 100]:
+                with precision(p):
+                    with _saved_flags():
+                        _set_flagmask(0)
+                        bf = BigFloat(value)
+                        flags = _get_flagmask()
+                    with _saved_flags():
+                        _set_flagmask(0)
+                        expected = BigFloat(value + ".0")
+                        expected_flags = _get_flagmask()
+                self.assertIdenticalBigFloat(bf, expected)
+                self.assertEqual(flags, expected_flags)
+
     if sys.version_info < (3,):
 
         def test_creation_from_unicode(self):
@@ -930,6 +969,16 @@ class BigFloatTests(unittest.TestCase):
         with self.assertRaises(TypeError):
             BigFloat(1j)
 
+    def test_no_instance_dict(self):
+        x = BigFloat(2)
+        self.assertFalse(hasattr(x, "__dict__"))
+        with self.assertRaises(AttributeError):
+            x.foo = 3
+
+    def test_weakref(self):
+        x = BigFloat(2)
+        self.assertIs(weakref.ref(x)(), x)
+
     def test_divmod(self):
         x = BigFloat.exact(1729)
         y = BigFloat.exact(53)
@@ -1012,6 +1061,12 @@ class BigFloatTests(unittest.TestCase):
                     # the same value
                     self.assertIdenticalFloat(float(bf), value)
 
+        # conversion from a float shouldn't affect the flags
+        set_flagstate(set())
+        for value in test_values:
+            BigFloat.exact(value)
+        self.assertEqual(get_flagstate(), set())
+
         self.assertRaises(TypeError, BigFloat.exact, 1.0, precision=200)
         self.assertRaises(
             TypeError, BigFloat.exact, float("nan"), precision=53,
@@ -1293,6 +1348,15 @@ class BigFloatTests(unittest.TestCase):
         self.assertEqual(ir(BigFloat("0.0")), (0, 1))
         self.assertEqual(ir(BigFloat("-0.0")), (0, 1))
 
+        # 53-bit values outside the range of normal floats.
+        wide = Context(precision=53, emin=EMIN_MIN, emax=EMAX_MAX)
+        n = 2 ** 1100 + 2 ** 1060
+        self.assertEqual(ir(BigFloat(n, context=wide)), (n, 1))
+        self.assertEqual(
+            ir(div(-3, BigFloat.exact(2 ** 1100), context=wide)),
+            (-3, 2 ** 1100),
+        )
+
         self.assertRaises(ValueError, ir, BigFloat("inf"))
         self.assertRaises(ValueError, ir, BigFloat("-inf"))
         self.assertRaises(ValueError, ir, BigFloat("nan"))
@@ -1755,6 +1819,24 @@ class BigFloatTests(unittest.TestCase):
         with self.assertRaises(ValueError):
             y = math.trunc(BigFloat("nan"))
 
+    @unittest.skipUnless(
+        sys.version_info >= (3,),
+        "math.ceil tests only applicable to Python 3",
+    )
+    def test_math_ceil_mixed_precisions(self):
+        # Temporaries used by ceil, floor and trunc are reused across calls;
+        # check that changes of precision between calls are handled.
+        values = [
+            BigFloat.exact(7 ** 100),
+            BigFloat("2.5"),
+            BigFloat.exact(3 ** 5000 + 1),
+            BigFloat("-2.5"),
+            BigFloat.exact(2 ** 300 + 1),
+        ]
+        expected = [7 ** 100, 3, 3 ** 5000 + 1, -2, 2 ** 300 + 1]
+        for _ in range(2):
+            self.assertEqual([math.ceil(x) for x in values], expected)
+
     def test__format_to_floating_precision(self):
         # Formatting to precision 1.  We need extra testing for this, since
         # it's not supported by the MPFR library itself.
@@ -2132,6 +2214,38 @@ class FlagTests(unittest.TestCase):
         BigFloat(1) * BigFloat(3)
         self.assertEqual(get_flagstate(), {ZeroDivision})
 
+    def test_flags_compare_equal_to_names(self):
+        self.assertEqual(Inexact, "Inexact")
+        self.assertEqual(hash(Overflow), hash("Overflow"))
+        self.assertNotEqual(Underflow, "Overflow")
+        self.assertEqual(repr(NanFlag), repr("NanFlag"))
+
+        set_flagstate({"ZeroDivision"})
+        self.assertEqual(get_flagstate(), {"ZeroDivision"})
+        self.assertTrue(bigfloat_test_flag("ZeroDivision"))
+        clear_flag("ZeroDivision")
+        self.assertFalse(bigfloat_test_flag(ZeroDivision))
+
+    def test_flags_are_strings(self):
+        self.assertIsInstance(Inexact, str)
+        self.assertEqual(sorted({Overflow, Inexact}), ["Inexact", "Overflow"])
+        self.assertEqual(",".join([NanFlag, Underflow]), "NanFlag,Underflow")
+        self.assertIs(pickle.loads(pickle.dumps(Inexact)), Inexact)
+
+    def test_flagmask_round_trip(self):
+        set_flagstate({Inexact, Underflow})
+        mask = _get_flagmask()
+        self.assertEqual(
+            mask & _all_flags_mask, Inexact.mask | Underflow.mask,
+        )
+
+        set_flagstate(_all_flags)
+        _set_flagmask(mask)
+        self.assertEqual(get_flagstate(), {Inexact, Underflow})
+
+        _set_flagmask(0)
+        self.assertEqual(get_flagstate(), set())
+
 
 class ABCTests(unittest.TestCase):
     def setUp(self):
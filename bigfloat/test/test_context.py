@@ -15,8 +15,10 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with the bigfloat package.  If not, see <http://www.gnu.org/licenses/>.
 
+import pickle
 import threading
 import unittest
+import weakref
 
 from six.moves import queue
 
@@ -25,6 +27,7 @@ from bigfloat.context import (
     getcontext,
     Context,
     DefaultContext,
+    EmptyContext,
     precision,
     RoundAwayFromZero,
     RoundTiesToEven,
@@ -98,6 +101,53 @@ class ContextTests(unittest.TestCase):
         self.assertIsInstance(c.subnormalize, bool)
         self.assertIn(c.rounding, all_rounding_modes)
 
+    def test_no_instance_dict(self):
+        c = Context(precision=100)
+        self.assertFalse(hasattr(c, "__dict__"))
+        with self.assertRaises(AttributeError):
+            c.foo = 3
+
+    def test_weakref(self):
+        c = Context(precision=20)
+        self.assertIs(weakref.ref(c)(), c)
+
+    def test_pickle(self):
+        contexts = [
+            EmptyContext,
+            DefaultContext,
+            Context(precision=20, emin=-30, subnormalize=False),
+            RoundTowardZero,
+        ]
+        for c in contexts:
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                unpickled = pickle.loads(pickle.dumps(c, protocol))
+                self.assertIs(type(unpickled), Context)
+                self.assertEqual(unpickled, c)
+                self.assertEqual(unpickled.rounding, c.rounding)
+
+    def test_setstate_from_instance_dict(self):
+        # Pickles written before Context used __slots__ restore the old
+        # instance dictionary through __setstate__.
+        c = Context.__new__(Context)
+        c.__setstate__(
+            {
+                "_precision": 20,
+                "_emin": -30,
+                "_emax": None,
+                "_subnormalize": False,
+                "_rounding": ROUND_TOWARD_ZERO,
+            }
+        )
+        self.assertEqual(
+            c,
+            Context(
+                precision=20,
+                emin=-30,
+                subnormalize=False,
+                rounding=ROUND_TOWARD_ZERO,
+            ),
+        )
+
     def test_bad_rounding_mode(self):
         with self.assertRaises(ValueError):
             Context(rounding=-1)
@@ -166,6 +216,47 @@ class ContextTests(unittest.TestCase):
                             getcontext().rounding, rounding_context.rounding,
                         )
 
+    def test_add(self):
+        c = Context(precision=200, emin=-50, emax=50)
+        self.assertEqual(c + EmptyContext, c)
+        self.assertEqual(EmptyContext + c, c)
+        self.assertEqual(
+            c + RoundTowardZero,
+            Context(
+                precision=200, emin=-50, emax=50, rounding=ROUND_TOWARD_ZERO
+            ),
+        )
+
+        # Merges of DefaultContext with rounding contexts are precomputed;
+        # check that they give the same results as a fresh merge.
+        for rounding_mode in all_rounding_modes:
+            self.assertEqual(
+                DefaultContext + Context(rounding=rounding_mode),
+                Context(
+                    precision=DefaultContext.precision,
+                    emin=DefaultContext.emin,
+                    emax=DefaultContext.emax,
+                    subnormalize=DefaultContext.subnormalize,
+                    rounding=rounding_mode,
+                ),
+            )
+        self.assertEqual(
+            (DefaultContext + RoundTowardPositive).rounding,
+            ROUND_TOWARD_POSITIVE,
+        )
+
+        with self.assertRaises(TypeError):
+            c + 3
+
+    def test_repr(self):
+        self.assertEqual(repr(EmptyContext), "Context()")
+        c = Context(precision=20, emin=-30, subnormalize=False)
+        self.assertEqual(
+            repr(c), "Context(precision=20, emin=-30, subnormalize=False)"
+        )
+        self.assertEqual(str(c), repr(c))
+        self.assertEqual(eval(repr(DefaultContext)), DefaultContext)
+
     def test_hashable(self):
         # create equal but non-identical contexts
         c1 = Context(
@@ -51,6 +51,11 @@ from mpfr import (
     mpz_set_str,
     mpz_get_str,
     mpfr_initialized_p,
+    mpfr_equal_p_list,
+    mpfr_less_p_list,
+    mpfr_add_list,
+    mpfr_set_d_list,
+    mpfr_new2,
     # 5.1 Initialization Functions
     mpfr_init2,
     mpfr_inits2,
@@ -296,6 +301,28 @@ def temporary_emax(emax):
         mpfr_set_emax(old_emax)
 
 
+# Operation and expected result for 7 op 11 at 30-bit precision.  Each
+# result is exactly representable as a float, so it's checked via mpfr_get_d.
+_BINARY_ARITHMETIC_CASES = [
+    (mpfr_add, 18.0),
+    (mpfr_sub, -4.0),
+    (mpfr_mul, 77.0),
+    (mpfr_fmod, 7.0),
+    (mpfr_pow, 1977326744.0),
+]
+
+
+# Setter, clearer and predicate for each of the MPFR flags.
+_FLAG_FUNCTIONS = [
+    (mpfr_set_underflow, mpfr_clear_underflow, mpfr_underflow_p),
+    (mpfr_set_overflow, mpfr_clear_overflow, mpfr_overflow_p),
+    (mpfr_set_divby0, mpfr_clear_divby0, mpfr_divby0_p),
+    (mpfr_set_nanflag, mpfr_clear_nanflag, mpfr_nanflag_p),
+    (mpfr_set_inexflag, mpfr_clear_inexflag, mpfr_inexflag_p),
+    (mpfr_set_erangeflag, mpfr_clear_erangeflag, mpfr_erangeflag_p),
+]
+
+
 # Factory function for creating and initializing Mpfr_t instances.
 def Mpfr(precision):
     self = Mpfr_t()
@@ -335,6 +362,18 @@ def negzero(precision=53):
 
 
 class TestMpfr(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Scratch operands shared by the arithmetic tests.  Each test that
+        # uses these sets their values before use, so no state leaks between
+        # tests; tests that change precision use their own instances.
+        cls._x30, cls._y30, cls._z30 = Mpfr(30), Mpfr(30), Mpfr(30)
+        cls._x53, cls._y53, cls._z53 = Mpfr(53), Mpfr(53), Mpfr(53)
+        # Read-only value of pi for the comparison tests.  Tests that
+        # modify their operands must not use this.
+        cls._pi30 = Mpfr(30)
+        mpfr_const_pi(cls._pi30, MPFR_RNDN)
+
     def setUp(self):
         # Make sure each test gets a fresh set of flags.
         self._flag_state = mpfr_flags_save()
@@ -351,6 +390,98 @@ class TestMpfr(unittest.TestCase):
         mpfr_clear(x)
         self.assertIs(mpfr_initialized_p(x), False)
 
+    def test_comparison_lists(self):
+        xs = [Mpfr(53) for _ in range(4)]
+        ys = [Mpfr(53) for _ in range(4)]
+        for x, a in zip(xs, [1.0, 2.0, 3.0, 4.0]):
+            mpfr_set_d(x, a, MPFR_RNDN)
+        for y, b in zip(ys, [1.0, 3.0, 2.0, 0.0]):
+            mpfr_set_d(y, b, MPFR_RNDN)
+        mpfr_set_nan(ys[3])
+        self.assertEqual(
+            mpfr_equal_p_list(xs, ys), [True, False, False, False],
+        )
+        self.assertEqual(
+            mpfr_less_p_list(xs, ys), [False, True, False, False],
+        )
+        self.assertEqual(mpfr_equal_p_list([], []), [])
+
+        with self.assertRaises(ValueError):
+            mpfr_equal_p_list(xs, ys[:3])
+        with self.assertRaises(TypeError):
+            mpfr_less_p_list(xs, ys[:3] + [None])
+        with self.assertRaises(ValueError):
+            mpfr_equal_p_list(xs, ys[:3] + [Mpfr_t()])
+
+    def test_add_list(self):
+        xs = [Mpfr(53) for _ in range(3)]
+        ys = [Mpfr(53) for _ in range(3)]
+        rops = [Mpfr(2) for _ in range(3)]
+        for x, a in zip(xs, [1.0, 2.0, 3.0]):
+            mpfr_set_d(x, a, MPFR_RNDN)
+        for y, b in zip(ys, [0.5, 3.0, 4.0]):
+            mpfr_set_d(y, b, MPFR_RNDN)
+        ternaries = mpfr_add_list(rops, xs, ys, MPFR_RNDN)
+        self.assertEqual(
+            [mpfr_get_d(rop, MPFR_RNDN) for rop in rops], [1.5, 4.0, 8.0],
+        )
+        self.assertEqual(ternaries[0], 0)
+        self.assertLess(ternaries[1], 0)
+        self.assertGreater(ternaries[2], 0)
+        self.assertEqual(mpfr_add_list([], [], [], MPFR_RNDN), [])
+
+        with self.assertRaises(ValueError):
+            mpfr_add_list(rops[:2], xs, ys, MPFR_RNDN)
+        with self.assertRaises(TypeError):
+            mpfr_add_list(rops, ys, ys[:2] + [None], MPFR_RNDN)
+        # Nothing is modified if any item is invalid.
+        self.assertEqual(
+            [mpfr_get_d(rop, MPFR_RNDN) for rop in rops], [1.5, 4.0, 8.0],
+        )
+        with self.assertRaises(ValueError):
+            mpfr_add_list(rops, xs, ys, -1)
+
+    def test_set_d_list(self):
+        rops = [Mpfr(53) for _ in range(3)]
+        ternaries = mpfr_set_d_list(rops, [1.5, -0.1, 1e300], MPFR_RNDN)
+        self.assertEqual(ternaries, [0, 0, 0])
+        self.assertEqual(
+            [mpfr_get_d(rop, MPFR_RNDN) for rop in rops], [1.5, -0.1, 1e300],
+        )
+        self.assertEqual(mpfr_set_d_list([], [], MPFR_RNDN), [])
+
+        with self.assertRaises(ValueError):
+            mpfr_set_d_list(rops, [1.0, 2.0], MPFR_RNDN)
+        with self.assertRaises(TypeError):
+            mpfr_set_d_list(rops, [1.0, 2.0, "3.0"], MPFR_RNDN)
+        with self.assertRaises(TypeError):
+            mpfr_set_d_list(rops[:2] + [None], [1.0, 2.0, 3.0], MPFR_RNDN)
+        # Nothing is modified if any item is invalid.
+        self.assertEqual(
+            [mpfr_get_d(rop, MPFR_RNDN) for rop in rops], [1.5, -0.1, 1e300],
+        )
+        with self.assertRaises(ValueError):
+            mpfr_set_d_list(rops, [1.0, 2.0, 3.0], -1)
+
+    def test_new2(self):
+        x = mpfr_new2(Mpfr_t, 37)
+        self.assertIs(type(x), Mpfr_t)
+        self.assertTrue(mpfr_initialized_p(x))
+        self.assertEqual(mpfr_get_prec(x), 37)
+        self.assertTrue(mpfr_nan_p(x))
+
+        class MpfrSubclass(Mpfr_t):
+            pass
+
+        y = mpfr_new2(MpfrSubclass, 2)
+        self.assertIs(type(y), MpfrSubclass)
+        self.assertEqual(mpfr_get_prec(y), 2)
+
+        with self.assertRaises(ValueError):
+            mpfr_new2(Mpfr_t, MPFR_PREC_MIN - 1)
+        with self.assertRaises(TypeError):
+            mpfr_new2(int, 53)
+
     def test_clear_on_uninitialized_instance(self):
         x = Mpfr_t()
         with self.assertRaises(ValueError):
@@ -623,10 +754,8 @@ class TestMpfr(unittest.TestCase):
         y = Mpfr(30)
         mpfr_const_pi(x, MPFR_RNDN)
         mpfr_set(y, x, MPFR_RNDN)
-        self.assertEqual(
-            mpfr_get_str(10, 0, x, MPFR_RNDN),
-            mpfr_get_str(10, 0, y, MPFR_RNDN),
-        )
+        self.assertIs(mpfr_equal_p(x, y), True)
+        self.assertEqual(mpfr_get_prec(y), mpfr_get_prec(x))
         # Invalid rounding mode.
         with self.assertRaises(ValueError):
             mpfr_set(y, x, -1)
@@ -636,9 +765,8 @@ class TestMpfr(unittest.TestCase):
         y = Mpfr(30)
         mpfr_const_pi(x, MPFR_RNDN)
         mpfr_neg(y, x, MPFR_RNDN)
-        self.assertEqual(
-            mpfr_get_str(10, 0, y, MPFR_RNDN), ("-31415926553", 1),
-        )
+        # pi rounded to 30 bits is exactly representable as a float.
+        self.assertEqual(mpfr_get_d(y, MPFR_RNDN), -3.1415926553308964)
 
     def test_abs(self):
         x = Mpfr(53)
@@ -654,26 +782,24 @@ class TestMpfr(unittest.TestCase):
             mpfr_get_d(y, MPFR_RNDN), 0.123,
         )
 
-    def test_add(self):
-        x = Mpfr(30)
-        y = Mpfr(30)
-        z = Mpfr(30)
+    def test_binary_arithmetic(self):
+        x, y, z = self._x30, self._y30, self._z30
         mpfr_set_d(x, 7.0, MPFR_RNDN)
         mpfr_set_d(y, 11.0, MPFR_RNDN)
-        mpfr_add(z, x, y, MPFR_RNDN)
-        self.assertEqual(
-            mpfr_get_str(10, 0, z, MPFR_RNDN), ("18000000000", 2),
-        )
+        for op, expected in _BINARY_ARITHMETIC_CASES:
+            op(z, x, y, MPFR_RNDN)
+            self.assertEqual(
+                mpfr_get_d(z, MPFR_RNDN), expected, msg=op.__name__,
+            )
 
-    def test_sub(self):
-        x = Mpfr(30)
-        y = Mpfr(30)
-        z = Mpfr(30)
+    def test_div(self):
+        # 7/11 isn't exact, so compare the decimal expansion instead.
+        x, y, z = self._x30, self._y30, self._z30
         mpfr_set_d(x, 7.0, MPFR_RNDN)
         mpfr_set_d(y, 11.0, MPFR_RNDN)
-        mpfr_sub(z, x, y, MPFR_RNDN)
+        mpfr_div(z, x, y, MPFR_RNDN)
         self.assertEqual(
-            mpfr_get_str(10, 0, z, MPFR_RNDN), ("-40000000000", 1),
+            mpfr_get_str(10, 0, z, MPFR_RNDN), ("63636363670", 0),
         )
 
     def test_dim(self):
@@ -691,17 +817,6 @@ class TestMpfr(unittest.TestCase):
             mpfr_get_d(z, MPFR_RNDN), 4.0,
         )
 
-    def test_mul(self):
-        x = Mpfr(30)
-        y = Mpfr(30)
-        z = Mpfr(30)
-        mpfr_set_d(x, 7.0, MPFR_RNDN)
-        mpfr_set_d(y, 11.0, MPFR_RNDN)
-        mpfr_mul(z, x, y, MPFR_RNDN)
-        self.assertEqual(
-            mpfr_get_str(10, 0, z, MPFR_RNDN), ("77000000000", 2),
-        )
-
     def test_sqr(self):
         x = Mpfr(53)
         y = Mpfr(53)
@@ -709,17 +824,6 @@ class TestMpfr(unittest.TestCase):
         mpfr_sqr(y, x, MPFR_RNDN)
         self.assertEqual(mpfr_get_si(y, MPFR_RNDN), 23 ** 2)
 
-    def test_div(self):
-        x = Mpfr(30)
-        y = Mpfr(30)
-        z = Mpfr(30)
-        mpfr_set_d(x, 7.0, MPFR_RNDN)
-        mpfr_set_d(y, 11.0, MPFR_RNDN)
-        mpfr_div(z, x, y, MPFR_RNDN)
-        self.assertEqual(
-            mpfr_get_str(10, 0, z, MPFR_RNDN), ("63636363670", 0),
-        )
-
     def test_sqrt(self):
         x = Mpfr(53)
         y = Mpfr(53)
@@ -774,17 +878,6 @@ class TestMpfr(unittest.TestCase):
         self.assertEqual(mpfr_get_d(y, MPFR_RNDN), 0.0)
         self.assertFalse(mpfr_signbit(y))
 
-    def test_pow(self):
-        x = Mpfr(30)
-        y = Mpfr(30)
-        z = Mpfr(30)
-        mpfr_set_d(x, 7.0, MPFR_RNDN)
-        mpfr_set_d(y, 11.0, MPFR_RNDN)
-        mpfr_pow(z, x, y, MPFR_RNDN)
-        self.assertEqual(
-            mpfr_get_str(10, 0, z, MPFR_RNDN), ("19773267440", 10),
-        )
-
     # 5.6 Comparison Functions
 
     def test_cmp(self):
@@ -837,36 +930,31 @@ class TestMpfr(unittest.TestCase):
         self.assertIs(mpfr_number_p(x), True)
 
     def test_equal_p(self):
-        x = Mpfr(30)
-        mpfr_const_pi(x, MPFR_RNDN)
+        x = self._pi30
         self.assertIs(
             mpfr_equal_p(x, x), True,
         )
 
     def test_lessequal_p(self):
-        x = Mpfr(30)
-        mpfr_const_pi(x, MPFR_RNDN)
+        x = self._pi30
         self.assertIs(
             mpfr_lessequal_p(x, x), True,
         )
 
     def test_less_p(self):
-        x = Mpfr(30)
-        mpfr_const_pi(x, MPFR_RNDN)
+        x = self._pi30
         self.assertIs(
             mpfr_less_p(x, x), False,
         )
 
     def test_greaterequal_p(self):
-        x = Mpfr(30)
-        mpfr_const_pi(x, MPFR_RNDN)
+        x = self._pi30
         self.assertIs(
             mpfr_greaterequal_p(x, x), True,
         )
 
     def test_greater_p(self):
-        x = Mpfr(30)
-        mpfr_const_pi(x, MPFR_RNDN)
+        x = self._pi30
         self.assertIs(
             mpfr_greater_p(x, x), False,
         )
@@ -1640,9 +1728,7 @@ class TestMpfr(unittest.TestCase):
             )
 
     def test_fmod(self):
-        r = Mpfr(53)
-        x = Mpfr(53)
-        y = Mpfr(53)
+        r, x, y = self._z53, self._x53, self._y53
         mpfr_set_d(x, 9.0, MPFR_RNDN)
         mpfr_set_d(y, 3.1415926535897931, MPFR_RNDN)
         mpfr_fmod(r, x, y, MPFR_RNDN)
@@ -2401,6 +2487,16 @@ class TestMpfr(unittest.TestCase):
             mpfr_get_str(62, 0, x, MPFR_RNDN), ("12000", 2),
         )
 
+        # Digit counts for n = 0, for precisions on either side of the
+        # cutoff for writing into a preallocated buffer.
+        for prec, ndigits in [(53, 17), (113, 36), (1000, 303)]:
+            x = Mpfr(prec)
+            mpfr_const_pi(x, MPFR_RNDN)
+            digits, exp = mpfr_get_str(10, 0, x, MPFR_RNDN)
+            self.assertEqual(len(digits), ndigits)
+            self.assertEqual(digits[:5], "31415")
+            self.assertEqual(exp, 1)
+
         # Type of result.
         digits, exp = mpfr_get_str(10, 0, x, MPFR_RNDN)
         self.assertIsInstance(digits, str)
@@ -2444,35 +2540,11 @@ class TestMpfr(unittest.TestCase):
 
     def test_flags(self):
         # Exercise flag getting and setting methods.
-        mpfr_set_underflow()
-        self.assertIs(mpfr_underflow_p(), True)
-        mpfr_clear_underflow()
-        self.assertIs(mpfr_underflow_p(), False)
-
-        mpfr_set_overflow()
-        self.assertIs(mpfr_overflow_p(), True)
-        mpfr_clear_overflow()
-        self.assertIs(mpfr_overflow_p(), False)
-
-        mpfr_set_divby0()
-        self.assertIs(mpfr_divby0_p(), True)
-        mpfr_clear_divby0()
-        self.assertIs(mpfr_divby0_p(), False)
-
-        mpfr_set_nanflag()
-        self.assertIs(mpfr_nanflag_p(), True)
-        mpfr_clear_nanflag()
-        self.assertIs(mpfr_nanflag_p(), False)
-
-        mpfr_set_inexflag()
-        self.assertIs(mpfr_inexflag_p(), True)
-        mpfr_clear_inexflag()
-        self.assertIs(mpfr_inexflag_p(), False)
-
-        mpfr_set_erangeflag()
-        self.assertIs(mpfr_erangeflag_p(), True)
-        mpfr_clear_erangeflag()
-        self.assertIs(mpfr_erangeflag_p(), False)
+        for set_flag, clear_flag, flag_p in _FLAG_FUNCTIONS:
+            set_flag()
+            self.assertIs(flag_p(), True, msg=flag_p.__name__)
+            clear_flag()
+            self.assertIs(flag_p(), False, msg=flag_p.__name__)
 
     def test_limits(self):
         # Regression test for badly-defined LONG_MAX and LONG_MIN.
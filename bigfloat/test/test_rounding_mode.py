@@ -17,7 +17,13 @@
 
 import unittest
 
-import mpfr as mpfr
+from mpfr import (
+    MPFR_RNDN,
+    MPFR_RNDZ,
+    MPFR_RNDU,
+    MPFR_RNDD,
+    MPFR_RNDA,
+)
 from bigfloat.rounding_mode import (
     RoundingMode,
     ROUND_TIES_TO_EVEN,
@@ -30,7 +36,7 @@ from bigfloat.rounding_mode import (
 
 class TestRoundingMode(unittest.TestCase):
     def test_rounding_mode_from_int(self):
-        rm = RoundingMode(mpfr.MPFR_RNDN)
+        rm = RoundingMode(MPFR_RNDN)
         self.assertEqual(rm, ROUND_TIES_TO_EVEN)
         self.assertIsInstance(rm, RoundingMode)
 
@@ -39,6 +45,13 @@ class TestRoundingMode(unittest.TestCase):
         self.assertEqual(rm, ROUND_TOWARD_POSITIVE)
         self.assertIsInstance(rm, RoundingMode)
 
+    def test_rounding_modes_are_interned(self):
+        self.assertIs(RoundingMode(MPFR_RNDN), ROUND_TIES_TO_EVEN)
+        self.assertIs(RoundingMode(MPFR_RNDZ), ROUND_TOWARD_ZERO)
+        self.assertIs(RoundingMode(MPFR_RNDU), ROUND_TOWARD_POSITIVE)
+        self.assertIs(RoundingMode(MPFR_RNDD), ROUND_TOWARD_NEGATIVE)
+        self.assertIs(RoundingMode(MPFR_RNDA), ROUND_AWAY_FROM_ZERO)
+
     def test_str(self):
         self.assertEqual(str(ROUND_TIES_TO_EVEN), "ROUND_TIES_TO_EVEN")
         self.assertEqual(str(ROUND_TOWARD_ZERO), "ROUND_TOWARD_ZERO")
@@ -54,11 +67,11 @@ class TestRoundingMode(unittest.TestCase):
         self.assertEqual(repr(ROUND_AWAY_FROM_ZERO), "ROUND_AWAY_FROM_ZERO")
 
     def test_int(self):
-        self.assertEqual(int(ROUND_TIES_TO_EVEN), mpfr.MPFR_RNDN)
-        self.assertEqual(int(ROUND_TOWARD_ZERO), mpfr.MPFR_RNDZ)
-        self.assertEqual(int(ROUND_TOWARD_POSITIVE), mpfr.MPFR_RNDU)
-        self.assertEqual(int(ROUND_TOWARD_NEGATIVE), mpfr.MPFR_RNDD)
-        self.assertEqual(int(ROUND_AWAY_FROM_ZERO), mpfr.MPFR_RNDA)
+        self.assertEqual(int(ROUND_TIES_TO_EVEN), MPFR_RNDN)
+        self.assertEqual(int(ROUND_TOWARD_ZERO), MPFR_RNDZ)
+        self.assertEqual(int(ROUND_TOWARD_POSITIVE), MPFR_RNDU)
+        self.assertEqual(int(ROUND_TOWARD_NEGATIVE), MPFR_RNDD)
+        self.assertEqual(int(ROUND_AWAY_FROM_ZERO), MPFR_RNDA)
 
     def test_type(self):
         self.assertTrue(issubclass(RoundingMode, int))
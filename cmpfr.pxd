@@ -43,6 +43,7 @@ cdef extern from "mpfr.h":
 
     # ctypedef __mpfr_struct mpfr_t[1]
     ctypedef __mpfr_struct *mpfr_ptr
+    ctypedef const __mpfr_struct *mpfr_srcptr
 
     # MPFR rounding modes
     ctypedef enum mpfr_rnd_t:
@@ -178,9 +179,9 @@ cdef extern from "mpfr.h":
     int mpfr_sgn(mpfr_ptr op)
     int mpfr_greater_p(mpfr_ptr op1, mpfr_ptr op2)
     int mpfr_greaterequal_p(mpfr_ptr op1, mpfr_ptr op2)
-    int mpfr_less_p(mpfr_ptr op1, mpfr_ptr op2)
+    int mpfr_less_p(mpfr_srcptr op1, mpfr_srcptr op2)
     int mpfr_lessequal_p(mpfr_ptr op1, mpfr_ptr op2)
-    int mpfr_equal_p(mpfr_ptr op1, mpfr_ptr op2)
+    int mpfr_equal_p(mpfr_srcptr op1, mpfr_srcptr op2)
     int mpfr_lessgreater_p(mpfr_ptr op1, mpfr_ptr op2)
     int mpfr_unordered_p(mpfr_ptr op1, mpfr_ptr op2)
 
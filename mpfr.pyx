@@ -99,7 +99,6 @@ def mpz_get_str(int base, Mpz_t op not None):
     used.
 
     """
-    cdef bytes digits
     cdef char *c_digits
     cdef free_func freefunc
     cdef size_t c_digits_len
@@ -114,20 +113,20 @@ def mpz_get_str(int base, Mpz_t op not None):
     c_digits = cgmp.mpz_get_str(NULL, base, &op._value)
     if c_digits == NULL:
         raise RuntimeError("Error during string conversion.")
-    c_digits_alloc = strlen(c_digits) + 1
+    c_digits_len = strlen(c_digits)
 
     # It's possible for the conversion from c_digits to digits to raise, so use
-    # a try-finally block to ensure that c_digits always gets freed.
+    # a try-finally block to ensure that c_digits always gets freed.  Return a
+    # plain string on Python 2, and a Unicode string on Python 3, converting
+    # straight from the C string (whose length is already known) in each case.
     try:
-        digits = bytes(c_digits)
+        if sys.version_info < (3,):
+            digits = c_digits[:c_digits_len]
+        else:
+            digits = c_digits[:c_digits_len].decode('ascii')
     finally:
-        freefunc(c_digits, c_digits_alloc)
-
-    # Return a plain string on Python 2, and a Unicode string on Python 3.
-    if sys.version_info < (3,):
-        return digits
-    else:
-        return digits.decode('ascii')
+        freefunc(c_digits, c_digits_len + 1)
+    return digits
 
 
 ###############################################################################
@@ -179,13 +178,17 @@ MPFR_FLAGS_ALL = cmpfr.MPFR_FLAGS_ALL
 # Forward declaration
 cdef class Mpfr_t
 
-# Checks for valid parameter ranges
-cdef int check_rounding_mode(cmpfr.mpfr_rnd_t rnd) except -1:
+# Checks for valid parameter ranges.  The checks made on (almost) every call
+# are declared inline, so that the C compiler can fold them into the caller.
+# They compare against the C-level constants from cmpfr rather than the
+# module-level Python names, so that the success path never touches Python
+# objects.
+cdef inline int check_rounding_mode(cmpfr.mpfr_rnd_t rnd) except -1:
     """
     Check that the given rounding mode is valid.  Raise ValueError if not.
 
     """
-    if MPFR_RNDN <= rnd <= MPFR_RNDF:
+    if cmpfr.MPFR_RNDN <= rnd <= cmpfr.MPFR_RNDF:
         return 0
     else:
         raise ValueError("invalid rounding mode {}".format(rnd))
@@ -204,7 +207,7 @@ cdef int check_cache_flags(cmpfr.mpfr_free_cache_t flags) except -1:
         raise ValueError("invalid flag mask {}".format(flags))
 
 
-cdef int check_base(int b, int allow_zero) except -1:
+cdef inline int check_base(int b, int allow_zero) except -1:
     """
     Check that the given base (for string conversion) is valid.
 
@@ -225,7 +228,7 @@ cdef int check_base(int b, int allow_zero) except -1:
             raise ValueError("base should be in the range 2 to 62 (inclusive)")
 
 
-cdef int check_get_str_n(int b, size_t n) except -1:
+cdef inline int check_get_str_n(int b, size_t n) except -1:
     """
     Check that the given number of requested digits is valid
     for the given base.
@@ -243,12 +246,12 @@ cdef int check_get_str_n(int b, size_t n) except -1:
     raise ValueError("n should be either 0 or at least 2")
 
 
-cdef int check_precision(cmpfr.mpfr_prec_t precision) except -1:
+cdef inline int check_precision(cmpfr.mpfr_prec_t precision) except -1:
     """
     Check that the given precision is valid.  Raise ValueError if not.
 
     """
-    if MPFR_PREC_MIN <= precision <= MPFR_PREC_MAX:
+    if cmpfr.MPFR_PREC_MIN <= precision <= cmpfr.MPFR_PREC_MAX:
         return 0
     else:
         raise ValueError(
@@ -258,7 +261,7 @@ cdef int check_precision(cmpfr.mpfr_prec_t precision) except -1:
         )
 
 
-cdef int check_initialized(Mpfr_t x) except -1:
+cdef inline int check_initialized(Mpfr_t x) except -1:
     """
     Check that the given Mpfr_t x instance has been initialized.
 
@@ -290,7 +293,7 @@ cdef int check_flag_mask(cmpfr.mpfr_flags_t flags) except -1:
     Check that the given flag mask is valid. Raise ValueError if not.
 
     """
-    if flags & MPFR_FLAGS_ALL == flags:
+    if flags & cmpfr.MPFR_FLAGS_ALL == flags:
         return 0
     else:
         raise ValueError("flag mask {} contains invalid flags".format(flags))
@@ -317,7 +320,7 @@ cdef decode_ternary_pair(int ternary_pair):
     return first_ternary, second_ternary
 
 
-cdef int cmpfr_initialized_p(cmpfr.mpfr_ptr op):
+cdef inline int cmpfr_initialized_p(cmpfr.mpfr_ptr op):
     """
     Return non-zero if op is initialized.  Return zero otherwise.
 
@@ -359,6 +362,157 @@ def mpfr_initialized_p(Mpfr_t op not None):
     """
     return bool(cmpfr_initialized_p(&op._value))
 
+def mpfr_new2(type cls not None, cmpfr.mpfr_prec_t prec):
+    """
+    Return a new instance of cls, initialized with precision prec.
+
+    cls should be Mpfr_t or a subclass of Mpfr_t.  The value of the new
+    instance is NaN.  This is equivalent to creating an uninitialized
+    instance with cls.__new__(cls) and then calling mpfr_init2 on it, but
+    needs only a single call.
+
+    """
+    cdef Mpfr_t x
+
+    check_precision(prec)
+    x = Mpfr_t.__new__(cls)
+    cmpfr.mpfr_init2(&x._value, prec)
+    return x
+
+cdef Mpfr_t check_list_item(object item):
+    """
+    Check that item, taken from a list argument, is an initialized Mpfr_t.
+
+    Return item on success.  Raise TypeError or ValueError otherwise.
+
+    """
+    if not isinstance(item, Mpfr_t):
+        raise TypeError("expected Mpfr_t instance, got {!r}".format(item))
+    check_initialized(<Mpfr_t>item)
+    return <Mpfr_t>item
+
+cdef Py_ssize_t check_list_lengths(list xs, list ys) except -1:
+    """
+    Check that xs and ys have the same length, and return that length.
+
+    """
+    if len(xs) != len(ys):
+        raise ValueError("list arguments should have the same length")
+    return len(xs)
+
+ctypedef int (*mpfr_predicate)(cmpfr.mpfr_srcptr, cmpfr.mpfr_srcptr)
+
+cdef list apply_predicate_list(mpfr_predicate pred, list xs, list ys):
+    """
+    Return the list of booleans bool(pred(xs[i], ys[i])) for each i.
+
+    """
+    cdef Py_ssize_t i, n
+    cdef Mpfr_t x, y
+
+    n = check_list_lengths(xs, ys)
+    result = [False] * n
+    for i in range(n):
+        x = check_list_item(xs[i])
+        y = check_list_item(ys[i])
+        result[i] = bool(pred(&x._value, &y._value))
+    return result
+
+def mpfr_equal_p_list(list xs not None, list ys not None):
+    """
+    Compare two lists of Mpfr_t instances elementwise for equality.
+
+    Return a list of booleans whose ith entry is mpfr_equal_p(xs[i], ys[i]).
+    This is equivalent to calling mpfr_equal_p in a Python-level loop, but
+    does the entire loop in C.
+
+    """
+    return apply_predicate_list(cmpfr.mpfr_equal_p, xs, ys)
+
+def mpfr_less_p_list(list xs not None, list ys not None):
+    """
+    Compare two lists of Mpfr_t instances elementwise for xs[i] < ys[i].
+
+    Return a list of booleans whose ith entry is mpfr_less_p(xs[i], ys[i]).
+    This is equivalent to calling mpfr_less_p in a Python-level loop, but
+    does the entire loop in C.
+
+    """
+    return apply_predicate_list(cmpfr.mpfr_less_p, xs, ys)
+
+def mpfr_add_list(list rops not None, list xs not None, list ys not None,
+                  cmpfr.mpfr_rnd_t rnd):
+    """
+    Elementwise addition of two lists of Mpfr_t instances.
+
+    Set rops[i] to xs[i] + ys[i] rounded in the direction rnd, for each i.
+    Return a list of the corresponding ternary values.  This is equivalent
+    to calling mpfr_add in a Python-level loop, but does the entire loop in
+    C.
+
+    """
+    cdef Py_ssize_t i, n
+    cdef Mpfr_t rop, x, y
+
+    check_rounding_mode(rnd)
+    n = check_list_lengths(xs, ys)
+    check_list_lengths(rops, xs)
+    # Check every item before the first mpfr_add, so that an invalid item
+    # leaves all of rops unchanged.
+    for i in range(n):
+        check_list_item(rops[i])
+        check_list_item(xs[i])
+        check_list_item(ys[i])
+
+    result = [0] * n
+    for i in range(n):
+        rop = <Mpfr_t>rops[i]
+        x = <Mpfr_t>xs[i]
+        y = <Mpfr_t>ys[i]
+        result[i] = cmpfr.mpfr_add(&rop._value, &x._value, &y._value, rnd)
+    return result
+
+def mpfr_set_d_list(list rops not None, list values not None,
+                    cmpfr.mpfr_rnd_t rnd):
+    """
+    Set a list of Mpfr_t instances from a list of floats.
+
+    Set rops[i] to values[i] rounded in the direction rnd, for each i.
+    Return a list of the corresponding ternary values.  This is equivalent
+    to calling mpfr_set_d in a Python-level loop, but does the entire loop
+    in C.
+
+    """
+    cdef Py_ssize_t i, n
+    cdef Mpfr_t rop
+
+    check_rounding_mode(rnd)
+    n = check_list_lengths(rops, values)
+    # malloc(0) may legitimately return NULL, so don't call it.
+    if n == 0:
+        return []
+
+    cdef double *doubles = <double *> libc.stdlib.malloc(
+        n * sizeof(double))
+    if not doubles:
+        raise MemoryError
+
+    try:
+        # Convert and check everything before the first mpfr_set_d, so that
+        # an invalid item leaves all of rops unchanged.
+        for i in range(n):
+            doubles[i] = values[i]
+        for i in range(n):
+            check_list_item(rops[i])
+
+        result = [0] * n
+        for i in range(n):
+            rop = <Mpfr_t>rops[i]
+            result[i] = cmpfr.mpfr_set_d(&rop._value, doubles[i], rnd)
+        return result
+    finally:
+        libc.stdlib.free(doubles)
+
 
 ##############################################################################
 # 5.1 Initialization Functions
@@ -685,16 +839,17 @@ def mpfr_strtofr(Mpfr_t rop not None, object s, int base, cmpfr.mpfr_rnd_t rnd):
     cdef char* endptr
     cdef char* startptr
     cdef bytes bytes_s
-    bytes_s = s.encode('ascii')
-
-    startptr = bytes_s
+    cdef int ternary
 
     check_initialized(rop)
     check_base(base, True)
     check_rounding_mode(rnd)
+
+    bytes_s = s.encode('ascii')
+    startptr = bytes_s
     ternary = cmpfr.mpfr_strtofr(
         &rop._value,
-        bytes_s,
+        startptr,
         &endptr,
         base,
         rnd,
@@ -881,6 +1036,10 @@ def mpfr_get_z(Mpz_t rop not None, Mpfr_t op not None, cmpfr.mpfr_rnd_t rnd):
     check_rounding_mode(rnd)
     return cmpfr.mpfr_get_z(&rop._value, &op._value, rnd)
 
+# Size of the stack buffer used by mpfr_get_str for short digit strings.
+cdef enum:
+    GET_STR_BUFFER_SIZE = 128
+
 def mpfr_get_str(int b, size_t n, Mpfr_t op not None, cmpfr.mpfr_rnd_t rnd):
     """
     Compute a base 'b' string representation for 'op'.
@@ -920,28 +1079,52 @@ def mpfr_get_str(int b, size_t n, Mpfr_t op not None, cmpfr.mpfr_rnd_t rnd):
 
     """
     cdef cmpfr.mpfr_exp_t exp
-    cdef bytes digits
     cdef char *c_digits
+    cdef char buffer[GET_STR_BUFFER_SIZE]
+    cdef size_t max_digits
 
     check_base(b, False)
     check_get_str_n(b, n)
     check_initialized(op)
     check_rounding_mode(rnd)
+
+    # When the digit string is short, MPFR can write it into a buffer on the
+    # stack, saving a malloc and free.  MPFR needs room for the digits, a
+    # sign and a terminating NUL, and at least 7 characters in total.  For
+    # n == 0, MPFR produces at most 2 + ceil(p * log(2) / log(b)) digits,
+    # where p is the precision of op; for b >= 8 that's at most p // 3 + 3.
+    if n != 0:
+        max_digits = n
+    elif b >= 8:
+        max_digits = cmpfr.mpfr_get_prec(&op._value) // 3 + 3
+    else:
+        max_digits = GET_STR_BUFFER_SIZE
+    if max_digits + 2 <= GET_STR_BUFFER_SIZE:
+        c_digits = cmpfr.mpfr_get_str(buffer, &exp, b, n, &op._value, rnd)
+        if c_digits == NULL:
+            raise RuntimeError("Error during string conversion.")
+        if sys.version_info < (3,):
+            digits = c_digits
+        else:
+            digits = c_digits.decode('ascii')
+        return digits, exp
+
     c_digits = cmpfr.mpfr_get_str(NULL, &exp, b, n, &op._value, rnd)
     if c_digits == NULL:
         raise RuntimeError("Error during string conversion.")
 
     # It's possible for the conversion from c_digits to digits to raise, so use
-    # a try-finally block to ensure that c_digits always gets freed.
+    # a try-finally block to ensure that c_digits always gets freed.  On
+    # Python 3, decode straight from the C string rather than going through
+    # an intermediate bytes object.
     try:
-        digits = bytes(c_digits)
+        if sys.version_info < (3,):
+            digits = c_digits
+        else:
+            digits = c_digits.decode('ascii')
     finally:
         cmpfr.mpfr_free_str(c_digits)
-
-    if sys.version_info < (3,):
-        return digits, exp
-    else:
-        return digits.decode('ascii'), exp
+    return digits, exp
 
 def mpfr_fits_ulong_p(Mpfr_t x not None, cmpfr.mpfr_rnd_t rnd):
     """